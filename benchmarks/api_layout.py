@@ -0,0 +1,134 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""API layout: cold/warm import time and memory of the split and the consolidated generated API.
+
+Each layout is generated into its own temporary copy of the package, then imported in fresh interpreters: cold
+(bytecode not cached yet), warm (bytecode cached) and after resolving every generated class, which is what a
+long-running client ends up doing.
+
+Run from the repository root (no generated API required):
+
+    python benchmarks/api_layout.py
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+GENERATE = """
+from compiler.error import compiler as error_compiler
+from compiler.api import compiler as api_compiler
+
+error_compiler.start()
+api_compiler.start(consolidated={})
+"""
+
+MEASURE = """
+import resource
+import time
+
+start = time.perf_counter()
+import pyrogram
+from pyrogram.api import types, functions
+types.messages.Messages, functions.messages.SendMessage
+elapsed = time.perf_counter() - start
+
+if {resolve}:
+    from pyrogram.api.core import Object
+    start = time.perf_counter()
+    for key in list(Object.all.paths):
+        Object.all[key]
+    elapsed += time.perf_counter() - start
+
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def generate(path: str, consolidated: bool):
+    for name in ["compiler", "pyrogram"]:
+        shutil.copytree(
+            os.path.join(ROOT, name), os.path.join(path, name),
+            ignore=shutil.ignore_patterns("__pycache__")
+        )
+
+    shutil.copy(os.path.join(ROOT, "NOTICE"), path)
+    subprocess.run([sys.executable, "-c", GENERATE.format(consolidated)], cwd=path, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def clear_bytecode(path: str):
+    for parent, dirs, _ in os.walk(path):
+        if "__pycache__" in dirs:
+            shutil.rmtree(os.path.join(parent, "__pycache__"))
+
+
+def measure(path: str, resolve: bool = False) -> tuple:
+    # Bytecode must be written on the cold run for the warm runs to be any different
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(resolve=resolve)],
+        cwd=path, env=env, check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout.split()
+
+    return float(output[0]), int(output[1])
+
+
+def count_files(path: str) -> int:
+    return sum(
+        len([f for f in files if f.endswith(".py")])
+        for _, _, files in os.walk(os.path.join(path, "pyrogram", "api"))
+    )
+
+
+def main(repeat: int = 5):
+    with tempfile.TemporaryDirectory() as tmp:
+        for consolidated in [False, True]:
+            label = "consolidated" if consolidated else "split"
+            path = os.path.join(tmp, label)
+            generate(path, consolidated)
+
+            cold = []
+
+            for _ in range(repeat):
+                clear_bytecode(path)
+                cold.append(measure(path))
+
+            measure(path, resolve=True)
+
+            warm = [measure(path) for _ in range(repeat)]
+            full = [measure(path, resolve=True) for _ in range(repeat)]
+
+            print("{:<14}files: {:>5}   cold: {:>7.1f} ms   warm: {:>7.1f} ms   "
+                  "all classes: {:>7.1f} ms / {:>6.1f} MiB".format(
+                label, count_files(path),
+                min(t for t, _ in cold) * 1000,
+                min(t for t, _ in warm) * 1000,
+                min(t for t, _ in full) * 1000,
+                min(m for _, m in full) / 1024
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Send path throughput: serialize + pack outgoing messages.
+
+Compares the previous send path against the current one. The previous path serialized the body with BytesIO-based
+write() methods, once for len(body) and once more for Message.write(), and MTProto.pack concatenated the result
+again. The current path writes the body once into a buffer with room left in front of it, which MTProto.pack fills
+in place. The previous implementation is vendored below (old_*) so that it can be measured side by side.
+
+Requires the generated API (python setup.py generate --api). Run from the repository root:
+
+    python benchmarks/send_path.py
+"""
+
+import os
+import sys
+import timeit
+from hashlib import sha1, sha256
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pyrogram.api import functions, types
+from pyrogram.api.core import Bytes, Int, Long, String
+from pyrogram.crypto import AES, KDF, MTProto
+from pyrogram.session.internals import MsgFactory, MsgId
+
+AUTH_KEY = os.urandom(256)
+AUTH_KEY_ID = sha1(AUTH_KEY).digest()[-8:]
+SESSION_ID = Long(MsgId())
+SALT = 0x616e67656c696361
+
+BODIES = {
+    "SendMessage": functions.messages.SendMessage(
+        peer=types.InputPeerUser(user_id=123456789, access_hash=-987654321987654321),
+        message="Hello, world! " * 16,
+        random_id=MsgId()
+    ),
+    "SaveBigFilePart (512 KiB)": functions.upload.SaveBigFilePart(
+        file_id=MsgId(),
+        file_part=0,
+        file_total_parts=100,
+        bytes=os.urandom(512 * 1024)
+    )
+}
+
+
+# Previous implementation: generated write() methods, Message.write() and MTProto.pack()
+
+def old_write_input_peer_user(obj) -> bytes:
+    b = BytesIO()
+    b.write(Int(obj.ID, False))
+
+    b.write(Int(obj.user_id))
+    b.write(Long(obj.access_hash))
+
+    return b.getvalue()
+
+
+def old_write_send_message(obj) -> bytes:
+    b = BytesIO()
+    b.write(Int(obj.ID, False))
+
+    flags = 0
+    flags |= (1 << 1) if obj.no_webpage is not None else 0
+    flags |= (1 << 5) if obj.silent is not None else 0
+    flags |= (1 << 6) if obj.background is not None else 0
+    flags |= (1 << 7) if obj.clear_draft is not None else 0
+    flags |= (1 << 0) if obj.reply_to_msg_id is not None else 0
+    flags |= (1 << 2) if obj.reply_markup is not None else 0
+    flags |= (1 << 3) if obj.entities is not None else 0
+    b.write(Int(flags))
+
+    b.write(old_write_input_peer_user(obj.peer))
+
+    b.write(String(obj.message))
+
+    b.write(Long(obj.random_id))
+
+    return b.getvalue()
+
+
+def old_write_save_big_file_part(obj) -> bytes:
+    b = BytesIO()
+    b.write(Int(obj.ID, False))
+
+    b.write(Long(obj.file_id))
+
+    b.write(Int(obj.file_part))
+
+    b.write(Int(obj.file_total_parts))
+
+    b.write(Bytes(obj.bytes))
+
+    return b.getvalue()
+
+
+OLD_WRITE = {
+    functions.messages.SendMessage: old_write_send_message,
+    functions.upload.SaveBigFilePart: old_write_save_big_file_part
+}
+
+
+def old_write(body) -> bytes:
+    return OLD_WRITE[type(body)](body)
+
+
+def old_message(body) -> bytes:
+    # len(body) serialized the body once, Message.write() once more
+    length = len(old_write(body))
+
+    b = BytesIO()
+
+    b.write(Long(MsgId()))
+    b.write(Int(0))
+    b.write(Int(length))
+    b.write(old_write(body))
+
+    return b.getvalue()
+
+
+def new_message(body, msg_factory=MsgFactory()) -> bytes:
+    return msg_factory(body).write()
+
+
+def old_path(body) -> bytes:
+    data = Long(SALT) + SESSION_ID + old_message(body)
+    padding = os.urandom(-(len(data) + 12) % 16 + 12)
+
+    msg_key_large = sha256(AUTH_KEY[88: 88 + 32] + data + padding).digest()
+    msg_key = msg_key_large[8:24]
+    aes_key, aes_iv = KDF(AUTH_KEY, msg_key, True)
+
+    return AUTH_KEY_ID + msg_key + AES.ige256_encrypt(data + padding, aes_key, aes_iv)
+
+
+def new_path(body, msg_factory=MsgFactory()) -> list:
+    return MTProto.pack(msg_factory(body), SALT, SESSION_ID, AUTH_KEY, AUTH_KEY_ID)
+
+
+def bench(func, body, number: int) -> float:
+    return number / min(timeit.repeat(lambda: func(body), number=number, repeat=5))
+
+
+def main():
+    for name, body in BODIES.items():
+        number = 2000 if len(body.write()) < 4096 else 20
+
+        for label, old_func, new_func in [
+            ("serialize", old_message, new_message),
+            ("serialize + encrypt", old_path, new_path)
+        ]:
+            old = bench(old_func, body, number)
+            new = bench(new_func, body, number)
+
+            print("{:<28}{:<22}old: {:>10.1f} ops/s   new: {:>10.1f} ops/s   x{:.2f}".format(
+                name, label, old, new, new / old
+            ))
+
+
+if __name__ == "__main__":
+    main()
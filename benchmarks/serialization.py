@@ -0,0 +1,166 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Serialization layer throughput and allocations.
+
+Builds realistic fixtures from the generated constructors and measures ops/s and peak traced memory of write(),
+Object.read and GzipPacked/MsgContainer round-trips, so that codegen and core changes can be compared against
+each other.
+
+Requires the generated API (python setup.py generate --api). Run from the repository root:
+
+    python benchmarks/serialization.py [filter]
+
+Only cases whose name contains the optional filter are run, e.g.: "python benchmarks/serialization.py read".
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pyrogram.api import types
+from pyrogram.api.core import BytesReader, GzipPacked, Message, MsgContainer, Object
+from pyrogram.session.internals import MsgId
+
+
+def message(i: int) -> types.Message:
+    return types.Message(
+        id=i,
+        to_id=types.PeerChannel(channel_id=1234567890),
+        date=1546300800 + i,
+        message="Message #{} with some **bold** text and a link to https://docs.pyrogram.ml".format(i),
+        out=i % 2 == 0,
+        from_id=123456789,
+        entities=[
+            types.MessageEntityBold(offset=25, length=8),
+            types.MessageEntityUrl(offset=55, length=24)
+        ],
+        media=types.MessageMediaPhoto(
+            photo=types.Photo(
+                id=i,
+                access_hash=-987654321987654321,
+                file_reference=os.urandom(16),
+                date=1546300800,
+                sizes=[
+                    types.PhotoSize(
+                        type=size,
+                        location=types.FileLocation(
+                            dc_id=2, volume_id=i, local_id=i, secret=-i, file_reference=os.urandom(16)
+                        ),
+                        w=w, h=w, size=w * 64
+                    )
+                    for size, w in [("s", 90), ("m", 320), ("x", 800)]
+                ]
+            )
+        ),
+        views=i * 10
+    )
+
+
+def users(count: int) -> list:
+    return [
+        types.User(
+            id=100000 + i, access_hash=-i, first_name="User", last_name=str(i), username="user{}".format(i),
+            status=types.UserStatusOnline(expires=1546300800)
+        )
+        for i in range(count)
+    ]
+
+
+def chats(count: int) -> list:
+    return [
+        types.Channel(
+            id=200000 + i, access_hash=-i, title="Channel {}".format(i), photo=types.ChatPhotoEmpty(),
+            date=1546300800, version=1
+        )
+        for i in range(count)
+    ]
+
+
+FIXTURES = {
+    "messages.Messages (100)": types.messages.Messages(
+        messages=[message(i) for i in range(100)], chats=chats(10), users=users(50)
+    ),
+    "Updates (20)": types.Update(
+        updates=[types.UpdateNewMessage(message=message(i), pts=i, pts_count=1) for i in range(20)],
+        users=users(20), chats=chats(5), date=1546300800, seq=1
+    ),
+    "upload.File (512 KiB)": types.upload.File(
+        type=types.storage.FileJpeg(), mtime=1546300800, bytes=os.urandom(512 * 1024)
+    )
+}
+
+CONTAINER = MsgContainer([
+    Message(body, MsgId(), i * 2 + 1, len(body))
+    for i, body in enumerate(
+        types.UpdateShortMessage(id=i, user_id=123456789, message="Hello", pts=i, pts_count=1, date=1546300800)
+        for i in range(100)
+    )
+])
+
+
+def cases():
+    for name, fixture in FIXTURES.items():
+        data = fixture.write()
+        gzipped = GzipPacked(fixture).write()
+
+        yield name, "write", lambda f=fixture: f.write()
+        yield name, "read", lambda d=data: Object.read(BytesReader(d))
+        yield name, "GzipPacked round-trip", lambda f=fixture: Object.read(BytesReader(GzipPacked(f).write()))
+        yield name, "GzipPacked read", lambda d=gzipped: Object.read(BytesReader(d))
+
+    data = CONTAINER.write()
+
+    yield "MsgContainer (100)", "write", CONTAINER.write
+    yield "MsgContainer (100)", "read", lambda: Object.read(BytesReader(data))
+    yield "MsgContainer (100)", "round-trip", lambda: Object.read(BytesReader(CONTAINER.write()))
+
+
+def ops(func) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+
+    return number / min(timer.repeat(repeat=5, number=number))
+
+
+def peak(func) -> int:
+    tracemalloc.start()
+
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(pattern: str = ""):
+    for name, label, func in cases():
+        if pattern.lower() not in "{} {}".format(name, label).lower():
+            continue
+
+        print("{:<26}{:<24}{:>12.1f} ops/s   peak: {:>9.1f} KiB".format(
+            name, label, ops(func), peak(func) / 1024
+        ))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -19,6 +19,7 @@
 import os
 import re
 import shutil
+from struct import calcsize
 
 HOME = "compiler/api"
 DESTINATION = "pyrogram/api"
@@ -32,6 +33,13 @@ FLAGS_RE_2 = re.compile(r"flags\.(\d+)\?([\w<>.]+)")
 FLAGS_RE_3 = re.compile(r"flags:#")
 INT_RE = re.compile(r"int(\d+)")
 
+# Fixed-size core types that can be (un)packed together with a single struct call
+STRUCT_FORMATS = {"int": "i", "long": "q", "double": "d"}
+CORE_TYPES_SIZES = {"int": 4, "long": 8, "int128": 16, "int256": 32, "double": 8, "Bool": 4}
+
+# Boxed fields are decoded straight through the constructor ID -> decode function table
+READ_BOXED = 'Object.readers[int.from_bytes(b.read(4), "little")]'
+
 core_types = ["int", "long", "int128", "int256", "double", "bytes", "string", "Bool"]
 types_to_constructors = {}
 types_to_functions = {}
@@ -125,6 +133,57 @@ def get_argument_type(arg):
     return name + t + (" = None" if is_flag else "")
 
 
+def get_skip_core_type(t: str):
+    if t in CORE_TYPES_SIZES:
+        return "b.offset += {}\n        ".format(CORE_TYPES_SIZES[t])
+
+    return "{}.skip(b)\n        ".format(t.title())
+
+
+def get_write_core_type(t: str, name: str):
+    # Bytes and strings are appended piecewise, so large payloads (e.g.: file parts) are copied only once
+    if t in ["bytes", "string"]:
+        return "{}.write_into(b, self.{})\n        ".format(t.title(), name)
+
+    return "b += {}(self.{})\n        ".format(t.title(), name)
+
+
+def get_struct_runs(args: list):
+    """Find runs of consecutive non-optional fixed-size fields, keyed by the index of their first field"""
+    runs = {}
+    run = []
+
+    for i, (arg_name, arg_type) in enumerate(args + [("", "")]):
+        if arg_type in STRUCT_FORMATS:
+            run.append(i)
+        else:
+            if len(run) > 1:
+                runs[run[0]] = [args[j] for j in run]
+
+            run = []
+
+    return runs
+
+
+def get_id_offset(args: list):
+    """Get the offset of a constructor "id" field, as long as it can be found without decoding the object"""
+    offset = 0
+
+    for arg_name, arg_type in args:
+        if arg_name == "id":
+            return offset if arg_type == "int" else None
+
+        if arg_type == "#":
+            offset += 4
+        elif FLAGS_RE.match(arg_type):
+            if arg_type.split("?")[1] != "true":
+                return None
+        elif arg_type in CORE_TYPES_SIZES:
+            offset += CORE_TYPES_SIZES[arg_type]
+        else:
+            return None
+
+
 class Combinator:
     def __init__(self,
                  section: str,
@@ -166,7 +225,13 @@ def sort_args(args):
     return args + flags
 
 
-def start():
+def start(consolidated: bool = False):
+    """Compile the TL schema.
+
+    By default every combinator gets its own module and namespaces are lazily loaded packages.
+    Pass consolidated=True to emit a single module per namespace instead (e.g.: pyrogram/api/types/messages.py),
+    exposing the very same public names.
+    """
     shutil.rmtree("{}/types".format(DESTINATION), ignore_errors=True)
     shutil.rmtree("{}/functions".format(DESTINATION), ignore_errors=True)
 
@@ -181,6 +246,12 @@ def start():
     with open("{}/template/pyrogram.txt".format(HOME), encoding="utf-8") as f:
         pyrogram_template = f.read()
 
+    with open("{}/template/namespace.txt".format(HOME), encoding="utf-8") as f:
+        namespace_template = f.read()
+
+    with open("{}/template/module.txt".format(HOME), encoding="utf-8") as f:
+        module_template = f.read()
+
     with open(NOTICE_PATH, encoding="utf-8") as f:
         notice = []
 
@@ -266,6 +337,8 @@ def start():
 
     total = len(combinators)
     current = 0
+    inits = {}
+    modules = {}
     for c in combinators:  # type: Combinator
         print("Compiling APIs... [{}%] {}".format(
             str(round(current * 100 / total)).rjust(3),
@@ -274,16 +347,12 @@ def start():
         current += 1
 
         path = "{}/{}/{}".format(DESTINATION, c.section, c.namespace)
-        os.makedirs(path, exist_ok=True)
-
-        init = "{}/__init__.py".format(path)
 
-        if not os.path.exists(init):
-            with open(init, "w", encoding="utf-8") as f:
-                f.write(notice + "\n\n")
-
-        with open(init, "a", encoding="utf-8") as f:
-            f.write("from .{} import {}\n".format(snek(c.name), capit(c.name)))
+        if consolidated:
+            os.makedirs("{}/{}".format(DESTINATION, c.section), exist_ok=True)
+        else:
+            os.makedirs(path, exist_ok=True)
+            inits.setdefault(path, []).append((capit(c.name), snek(c.name)))
 
         sorted_args = sort_args(c.args)
 
@@ -343,9 +412,42 @@ def start():
             if references:
                 docstring_args += "\n\n    See Also:\n        This object can be returned by " + references + "."
 
-        write_types = read_types = "" if c.has_flags else "# No flags\n        "
+        write_types = read_types = skip_types = "" if c.has_flags else "# No flags\n        "
+
+        struct_runs = get_struct_runs(c.args)
+        structs = []
+        skip = 0
+
+        for i, (arg_name, arg_type) in enumerate(c.args):
+            if skip:
+                skip -= 1
+                continue
+
+            if i in struct_runs:
+                run = struct_runs[i]
+                names = [j[0] for j in run]
+                # Unique per namespace, so that classes can share a single module (see "consolidated")
+                struct_name = "_{}_{}".format(snek(c.name), len(structs))
+                struct_format = "<" + "".join(STRUCT_FORMATS[j[1]] for j in run)
+
+                structs.append("{} = Struct(\"{}\")".format(struct_name, struct_format))
+                skip = len(run) - 1
+
+                write_types += "\n        "
+                write_types += "b += {}.pack({})\n        ".format(
+                    struct_name, ", ".join("self.{}".format(j) for j in names)
+                )
+
+                read_types += "\n        "
+                read_types += "{} = {}.unpack(b.read({}))\n        ".format(
+                    ", ".join(names), struct_name, calcsize(struct_format)
+                )
+
+                skip_types += "\n        "
+                skip_types += "b.offset += {}\n        ".format(calcsize(struct_format))
+
+                continue
 
-        for arg_name, arg_type in c.args:
             flag = FLAGS_RE_2.findall(arg_type)
 
             if arg_name == "flags" and arg_type == "#":
@@ -360,11 +462,12 @@ def start():
                 write_flags = "\n        ".join([
                     "flags = 0",
                     "\n        ".join(write_flags),
-                    "b.write(Int(flags))\n        "
+                    "b += Int(flags)\n        "
                 ])
 
                 write_types += write_flags
                 read_types += "flags = Int.read(b)\n        "
+                skip_types += "flags = Int.read(b)\n        "
 
                 continue
 
@@ -377,94 +480,153 @@ def start():
                 elif flag_type in core_types:
                     write_types += "\n        "
                     write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write({}(self.{}))\n        ".format(flag_type.title(), arg_name)
+                    write_types += get_write_core_type(flag_type, arg_name)
 
                     read_types += "\n        "
                     read_types += "{} = {}.read(b) if flags & (1 << {}) else None".format(
                         arg_name, flag_type.title(), index
                     )
+
+                    skip_types += "\n        "
+                    skip_types += "if flags & (1 << {}):\n            ".format(index)
+                    skip_types += get_skip_core_type(flag_type)
                 elif "vector" in flag_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
                     write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "Vector.write_into(b, self.{}{})\n        ".format(
                         arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
 
                     read_types += "\n        "
-                    read_types += "{} = Object.read(b{}) if flags & (1 << {}) else []\n        ".format(
-                        arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else "", index
+                    read_types += "{} = {}(b{}) if flags & (1 << {}) else []\n        ".format(
+                        arg_name, READ_BOXED, ", {}".format(sub_type.title()) if sub_type in core_types else "", index
+                    )
+
+                    skip_types += "\n        "
+                    skip_types += "if flags & (1 << {}):\n            ".format(index)
+                    skip_types += "Object.skip(b{})\n        ".format(
+                        ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
                 else:
                     write_types += "\n        "
                     write_types += "if self.{} is not None:\n            ".format(arg_name)
-                    write_types += "b.write(self.{}.write())\n        ".format(arg_name)
+                    write_types += "self.{}.write_into(b)\n        ".format(arg_name)
 
                     read_types += "\n        "
-                    read_types += "{} = Object.read(b) if flags & (1 << {}) else None\n        ".format(
-                        arg_name, index
+                    read_types += "{} = {}(b) if flags & (1 << {}) else None\n        ".format(
+                        arg_name, READ_BOXED, index
                     )
+
+                    skip_types += "\n        "
+                    skip_types += "if flags & (1 << {}):\n            ".format(index)
+                    skip_types += "Object.skip(b)\n        "
             else:
                 if arg_type in core_types:
                     write_types += "\n        "
-                    write_types += "b.write({}(self.{}))\n        ".format(arg_type.title(), arg_name)
+                    write_types += get_write_core_type(arg_type, arg_name)
 
                     read_types += "\n        "
                     read_types += "{} = {}.read(b)\n        ".format(arg_name, arg_type.title())
+
+                    skip_types += "\n        "
+                    skip_types += get_skip_core_type(arg_type)
                 elif "vector" in arg_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "Vector.write_into(b, self.{}{})\n        ".format(
                         arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
 
                     read_types += "\n        "
-                    read_types += "{} = Object.read(b{})\n        ".format(
-                        arg_name, ", {}".format(sub_type.title()) if sub_type in core_types else ""
+                    read_types += "{} = {}(b{})\n        ".format(
+                        arg_name, READ_BOXED, ", {}".format(sub_type.title()) if sub_type in core_types else ""
+                    )
+
+                    skip_types += "\n        "
+                    skip_types += "Object.skip(b{})\n        ".format(
+                        ", {}".format(sub_type.title()) if sub_type in core_types else ""
                     )
                 else:
                     write_types += "\n        "
-                    write_types += "b.write(self.{}.write())\n        ".format(arg_name)
+                    write_types += "self.{}.write_into(b)\n        ".format(arg_name)
 
                     read_types += "\n        "
-                    read_types += "{} = Object.read(b)\n        ".format(arg_name)
+                    read_types += "{} = {}(b)\n        ".format(arg_name, READ_BOXED)
+
+                    skip_types += "\n        "
+                    skip_types += "Object.skip(b)\n        "
+
+        if not c.args:
+            skip_types += "pass"
 
         if c.docs:
             description = c.docs.split("|")[0].split("§")[1]
             docstring_args = description + "\n\n    " + docstring_args
 
-        with open("{}/{}.py".format(path, snek(c.name)), "w", encoding="utf-8") as f:
-            if c.docs:
-                f.write(
-                    pyrogram_template.format(
-                        notice=notice,
-                        class_name=capit(c.name),
-                        docstring_args=docstring_args,
-                        object_id=c.id,
-                        arguments=arguments,
-                        fields=fields
-                    )
-                )
-            else:
-                f.write(
-                    mtproto_template.format(
-                        notice=notice,
-                        class_name=capit(c.name),
-                        docstring_args=docstring_args,
-                        object_id=c.id,
-                        arguments=arguments,
-                        fields=fields,
-                        read_types=read_types,
-                        write_types=write_types,
-                        return_arguments=", ".join(
-                            ["{0}={0}".format(i[0]) for i in sorted_args if i != ("flags", "#")]
-                        ),
-                        slots=", ".join(['"{}"'.format(i[0]) for i in sorted_args if i != ("flags", "#")]),
-                        qualname="{}{}".format("{}.".format(c.namespace) if c.namespace else "", c.name)
-                    )
+        if c.docs:
+            source = pyrogram_template.format(
+                class_name=capit(c.name),
+                docstring_args=docstring_args,
+                object_id=c.id,
+                arguments=arguments,
+                fields=fields
+            )
+        else:
+            source = mtproto_template.format(
+                class_name=capit(c.name),
+                docstring_args=docstring_args,
+                object_id=c.id,
+                arguments=arguments,
+                fields=fields,
+                read_types=read_types,
+                write_types=write_types,
+                skip_types=skip_types,
+                return_arguments=", ".join(
+                    ["{0}={0}".format(i[0]) for i in sorted_args if i != ("flags", "#")]
+                ),
+                slots=", ".join(['"{}"'.format(i[0]) for i in sorted_args if i != ("flags", "#")]),
+                qualname="{}{}".format("{}.".format(c.namespace) if c.namespace else "", c.name)
+            )
+
+        if consolidated:
+            module = modules.setdefault(path, ([], [], []))
+        else:
+            module = ([], [], [])
+            modules["{}/{}".format(path, snek(c.name))] = module
+
+        module[0].append(source)
+        module[1].extend(structs)
+        module[2].append(bool(c.docs))
+
+    for path, (sources, structs, docs) in modules.items():
+        if all(docs):
+            imports = "from pyrogram.api.core import Object"
+        else:
+            imports = "from io import BytesIO{}\n\nfrom pyrogram.api.core import *".format(
+                "\nfrom struct import Struct" if structs else ""
+            )
+
+        if path.endswith("/"):
+            # A section root module (e.g.: pyrogram/api/types/__init__.py), which also brings in its namespaces
+            section = os.path.basename(path.rstrip("/"))
+            sub_namespaces = sorted(namespaces[section])
+            path += "__init__"
+
+            if sub_namespaces:
+                sources.append("from . import {}\n".format(", ".join(sub_namespaces)))
+
+        with open("{}.py".format(path), "w", encoding="utf-8") as f:
+            f.write(
+                module_template.format(
+                    notice=notice,
+                    imports=imports,
+                    structs="\n" + "\n".join(structs) + "\n" if structs else "",
+                    classes="\n\n".join(sources)
                 )
+            )
 
     with open("{}/all.py".format(DESTINATION), "w", encoding="utf-8") as f:
         f.write(notice + "\n\n")
@@ -487,9 +649,35 @@ def start():
 
         f.write("\n}\n")
 
-    for k, v in namespaces.items():
-        with open("{}/{}/__init__.py".format(DESTINATION, k), "a", encoding="utf-8") as f:
-            f.write("from . import {}\n".format(", ".join([i for i in v])) if v else "")
+        f.write("\nid_offsets = {")
+
+        for c in combinators:
+            if c.section == "types" and not c.docs:
+                id_offset = get_id_offset(c.args)
+
+                if id_offset is not None:
+                    f.write("\n    {}: {},".format(c.id, id_offset))
+
+        f.write("\n}\n")
+
+    for path, names in inits.items():
+        section = os.path.basename(path.rstrip("/"))
+        sub_namespaces = sorted(namespaces.get(section, [])) if path.endswith("/") else []
+
+        with open("{}/__init__.py".format(path), "w", encoding="utf-8") as f:
+            f.write(
+                namespace_template.format(
+                    notice=notice,
+                    modules="".join(
+                        "\n    \"{}\": \".{}\",".format(name, module)
+                        for name, module in names
+                    ),
+                    namespaces_all=" + [{}]".format(
+                        ", ".join("\"{}\"".format(i) for i in sub_namespaces)
+                    ) if sub_namespaces else "",
+                    namespaces="\nfrom . import {}\n".format(", ".join(sub_namespaces)) if sub_namespaces else ""
+                )
+            )
 
 
 if "__main__" == __name__:
@@ -16,11 +16,10 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from importlib import import_module
-
-from .all import objects
+from .all import objects, id_offsets
 from .core.object import Object
+from .core.primitives.vector import LazyVector
 
-for k, v in objects.items():
-    path, name = v.rsplit(".", 1)
-    Object.all[k] = getattr(import_module(path), name)
+# Classes are imported on demand, the first time their constructor ID is seen
+Object.all.paths.update(objects)
+LazyVector.id_offsets.update(id_offsets)
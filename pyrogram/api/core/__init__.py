@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from .bytes_reader import BytesReader
 from .future_salt import FutureSalt
 from .future_salts import FutureSalts
 from .gzip_packed import GzipPacked
@@ -24,5 +25,5 @@ from .msg_container import MsgContainer
 from .object import Object
 from .primitives import (
     Bool, BoolTrue, BoolFalse, Bytes, Double,
-    Int, Long, Int128, Int256, Null, String, Vector
+    Int, Long, Int128, Int256, Null, String, Vector, LazyVector
 )
@@ -0,0 +1,60 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+class BytesReader:
+    """A read-only, zero-copy stand-in for :obj:`io.BytesIO` used to decode TL objects.
+
+    Reads return :obj:`memoryview` slices of the underlying buffer instead of copies, so that nested objects (e.g.:
+    the body of a Message inside a MsgContainer) can be decoded in place.
+    """
+
+    __slots__ = ["view", "offset"]
+
+    def __init__(self, data: bytes or bytearray or memoryview):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def read(self, n: int = -1) -> memoryview:
+        if n < 0:
+            n = len(self.view) - self.offset
+
+        chunk = self.view[self.offset:self.offset + n]
+        self.offset += len(chunk)
+
+        return chunk
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self.offset
+        elif whence == 2:
+            offset += len(self.view)
+
+        self.offset = max(0, offset)
+
+        return self.offset
+
+    def tell(self) -> int:
+        return self.offset
+
+    def getbuffer(self) -> memoryview:
+        return self.view
+
+    def getvalue(self) -> bytes:
+        return self.view.tobytes()
@@ -19,6 +19,7 @@
 from datetime import datetime
 from io import BytesIO
 
+from .bytes_reader import BytesReader
 from .object import Object
 from .primitives import Int, Long
 
@@ -42,3 +43,7 @@ class FutureSalt(Object):
         salt = Long.read(b)
 
         return FutureSalt(valid_since, valid_until, salt)
+
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        b.offset += 16
@@ -20,6 +20,7 @@ from datetime import datetime
 from io import BytesIO
 
 from . import FutureSalt
+from .bytes_reader import BytesReader
 from .object import Object
 from .primitives import Int, Long
 
@@ -45,3 +46,8 @@ class FutureSalts(Object):
         salts = [FutureSalt.read(b) for _ in range(count)]
 
         return FutureSalts(req_msg_id, now, salts)
+
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        b.offset += 12
+        b.offset += Int.read(b) * 16
@@ -19,6 +19,7 @@
 from gzip import compress, decompress
 from io import BytesIO
 
+from .bytes_reader import BytesReader
 from .object import Object
 from .primitives import Int, Bytes
 
@@ -37,24 +38,23 @@ class GzipPacked(Object):
     def read(b: BytesIO, *args) -> "GzipPacked":
         # Return the Object itself instead of a GzipPacked wrapping it
         return Object.read(
-            BytesIO(
+            BytesReader(
                 decompress(
                     Bytes.read(b)
                 )
             )
         )
 
-    def write(self) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        Bytes.skip(b)
 
-        b.write(Int(self.ID, False))
+    def write_into(self, b: bytearray, *args):
+        b += Int(self.ID, False)
 
-        b.write(
-            Bytes(
-                compress(
-                    self.packed_data.write()
-                )
+        Bytes.write_into(
+            b,
+            compress(
+                self.packed_data.write()
             )
         )
-
-        return b.getvalue()
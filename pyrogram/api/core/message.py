@@ -18,6 +18,7 @@
 
 from io import BytesIO
 
+from .bytes_reader import BytesReader
 from .object import Object
 from .primitives import Int, Long
 
@@ -29,7 +30,11 @@ class Message(Object):
 
     QUALNAME = "Message"
 
-    def __init__(self, body: Object, msg_id: int, seq_no: int, length: int):
+    # Bodies serialized in advance (see MsgFactory) start with RESERVED spare bytes, where MTProto.pack writes the
+    # salt, the session_id and the message header in place instead of copying the whole body after them
+    RESERVED = 32
+
+    def __init__(self, body: Object or bytearray, msg_id: int, seq_no: int, length: int):
         self.msg_id = msg_id
         self.seq_no = seq_no
         self.length = length
@@ -42,14 +47,20 @@ class Message(Object):
         length = Int.read(b)
         body = b.read(length)
 
-        return Message(Object.read(BytesIO(body)), msg_id, seq_no, length)
+        return Message(Object.read(BytesReader(body)), msg_id, seq_no, length)
 
-    def write(self) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        b.offset += 12
+        b.offset += Int.read(b)
 
-        b.write(Long(self.msg_id))
-        b.write(Int(self.seq_no))
-        b.write(Int(self.length))
-        b.write(self.body.write())
+    def write_into(self, b: bytearray, *args):
+        b += Long(self.msg_id)
+        b += Int(self.seq_no)
+        b += Int(self.length)
 
-        return b.getvalue()
+        # Outgoing messages carry their body already serialized (see MsgFactory)
+        if isinstance(self.body, bytearray):
+            b += memoryview(self.body)[self.RESERVED:]
+        else:
+            self.body.write_into(b)
@@ -18,6 +18,7 @@
 
 from io import BytesIO
 
+from .bytes_reader import BytesReader
 from .message import Message
 from .object import Object
 from .primitives import Int
@@ -38,15 +39,14 @@ class MsgContainer(Object):
         count = Int.read(b)
         return MsgContainer([Message.read(b) for _ in range(count)])
 
-    def write(self) -> bytes:
-        b = BytesIO()
-
-        b.write(Int(self.ID, False))
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        for _ in range(Int.read(b)):
+            Message.skip(b)
 
-        count = len(self.messages)
-        b.write(Int(count))
+    def write_into(self, b: bytearray, *args):
+        b += Int(self.ID, False)
+        b += Int(len(self.messages))
 
         for message in self.messages:
-            b.write(message.write())
-
-        return b.getvalue()
+            message.write_into(b)
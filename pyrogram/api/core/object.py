@@ -18,12 +18,45 @@
 
 from collections import OrderedDict
 from datetime import datetime
+from importlib import import_module
 from io import BytesIO
 from json import dumps
 
 
+class Registry(dict):
+    """Constructor ID -> class mapping that imports each generated module only the first time its ID is needed.
+
+    Unknown IDs raise KeyError, just like a plain dict would.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.paths = {}
+
+    def __missing__(self, key: int):
+        path, name = self.paths[key].rsplit(".", 1)
+        value = self[key] = getattr(import_module(path), name)
+
+        return value
+
+
+class Readers(dict):
+    """Constructor ID -> decode function mapping, filled from :obj:`Object.all` the first time an ID is read.
+
+    Generated code calls into this table directly when decoding boxed fields, which saves going through
+    :meth:`Object.read` and the class lookup for every nested object.
+    """
+
+    def __missing__(self, key: int):
+        value = self[key] = Object.all[key].read
+
+        return value
+
+
 class Object:
-    all = {}
+    all = Registry()
+    readers = Readers()
 
     __slots__ = []
 
@@ -31,9 +64,20 @@ class Object:
 
     @staticmethod
     def read(b: BytesIO, *args):
-        return Object.all[int.from_bytes(b.read(4), "little")].read(b, *args)
+        return Object.readers[int.from_bytes(b.read(4), "little")](b, *args)
+
+    # Skipping is only used to index lazily decoded vectors, which always read from a BytesReader
+    @staticmethod
+    def skip(b: "BytesReader", *args):
+        b.offset += 4
+        Object.all[int.from_bytes(b.view[b.offset - 4:b.offset], "little")].skip(b, *args)
 
     def write(self, *args) -> bytes:
+        b = bytearray()
+        self.write_into(b, *args)
+        return bytes(b)
+
+    def write_into(self, b: bytearray, *args):
         pass
 
     def __str__(self) -> str:
@@ -56,6 +100,11 @@ def remove_none(obj):
 
 
 def default(o: "Object"):
+    from .primitives.vector import LazyVector
+
+    if isinstance(o, LazyVector):
+        return list(o)
+
     try:
         content = {i: getattr(o, i) for i in o.__slots__}
 
@@ -22,4 +22,4 @@ from .double import Double
 from .int import Int, Long, Int128, Int256
 from .null import Null
 from .string import String
-from .vector import Vector
+from .vector import Vector, LazyVector
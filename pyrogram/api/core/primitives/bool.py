@@ -18,6 +18,7 @@
 
 from io import BytesIO
 
+from ..bytes_reader import BytesReader
 from ..object import Object
 
 
@@ -29,6 +30,10 @@ class BoolFalse(Object):
     def read(cls, *args) -> bool:
         return cls.value
 
+    @staticmethod
+    def skip(*args):
+        pass
+
     def __new__(cls) -> bytes:
         return cls.ID.to_bytes(4, "little")
 
@@ -43,5 +48,9 @@ class Bool(Object):
     def read(cls, b: BytesIO) -> bool:
         return int.from_bytes(b.read(4), "little") == BoolTrue.ID
 
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        b.offset += 4
+
     def __new__(cls, value: bool) -> BoolTrue or BoolFalse:
         return BoolTrue() if value else BoolFalse()
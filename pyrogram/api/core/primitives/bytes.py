@@ -18,6 +18,7 @@
 
 from io import BytesIO
 
+from ..bytes_reader import BytesReader
 from ..object import Object
 
 
@@ -34,7 +35,32 @@ class Bytes(Object):
             x = b.read(length)
             b.read(-length % 4)
 
-        return x
+        # Reads from a BytesReader are views over the whole packet: copy out just the value
+        return bytes(x)
+
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        length = b.view[b.offset]
+
+        if length <= 253:
+            b.offset += 1 + length + (-(length + 1) % 4)
+        else:
+            length = int.from_bytes(b.view[b.offset + 1:b.offset + 4], "little")
+            b.offset += 4 + length + (-length % 4)
+
+    @staticmethod
+    def write_into(b: bytearray, value: bytes):
+        length = len(value)
+
+        if length <= 253:
+            b.append(length)
+            b += value
+            b += bytes(-(length + 1) % 4)
+        else:
+            b.append(254)
+            b += length.to_bytes(3, "little")
+            b += value
+            b += bytes(-length % 4)
 
     def __new__(cls, value: bytes) -> bytes:
         length = len(value)
@@ -19,6 +19,7 @@
 from io import BytesIO
 from struct import unpack, pack
 
+from ..bytes_reader import BytesReader
 from ..object import Object
 
 
@@ -27,5 +28,9 @@ class Double(Object):
     def read(b: BytesIO, *args) -> float:
         return unpack("d", b.read(8))[0]
 
+    @staticmethod
+    def skip(b: BytesReader, *args):
+        b.offset += 8
+
     def __new__(cls, value: float) -> bytes:
         return pack("d", value)
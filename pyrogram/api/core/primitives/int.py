@@ -18,6 +18,7 @@
 
 from io import BytesIO
 
+from ..bytes_reader import BytesReader
 from ..object import Object
 
 
@@ -28,6 +29,10 @@ class Int(Object):
     def read(cls, b: BytesIO, signed: bool = True) -> int:
         return int.from_bytes(b.read(cls.SIZE), "little", signed=signed)
 
+    @classmethod
+    def skip(cls, b: BytesReader, *args):
+        b.offset += cls.SIZE
+
     def __new__(cls, value: int, signed: bool = True) -> bytes:
         return value.to_bytes(cls.SIZE, "little", signed=signed)
 
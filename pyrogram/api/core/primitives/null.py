@@ -28,5 +28,9 @@ class Null(Object):
     def read(b: BytesIO, *args) -> None:
         return None
 
+    @staticmethod
+    def skip(*args):
+        pass
+
     def __new__(cls) -> bytes:
         return cls.ID.to_bytes(4, "little")
@@ -26,5 +26,9 @@ class String(Bytes):
     def read(b: BytesIO, *args) -> str:
         return super(String, String).read(b).decode(errors="replace")
 
+    @staticmethod
+    def write_into(b: bytearray, value: str):
+        Bytes.write_into(b, value.encode())
+
     def __new__(cls, value: str) -> bytes:
         return super().__new__(cls, value.encode())
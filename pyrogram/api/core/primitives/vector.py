@@ -16,39 +16,202 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections.abc import Mapping, Sequence
 from io import BytesIO
 
 from . import Int
+from ..bytes_reader import BytesReader
 from ..object import Object
 
 
+class LazyVector(Sequence):
+    """A list-like Vector of boxed objects whose elements are decoded on first access.
+
+    Only element offsets are recorded while reading, and the underlying buffer is kept alive until the vector itself
+    is garbage collected. Elements whose constructor has an "id" at a known position (users, chats, messages, ...)
+    can be looked up by id without decoding the rest of the vector.
+    """
+
+    # Constructor ID -> offset of its "id" field, populated by pyrogram.api along with Object.all
+    id_offsets = {}
+
+    __slots__ = ["view", "offsets", "items", "index"]
+
+    def __init__(self, view: memoryview, offsets: list):
+        self.view = view
+        self.offsets = offsets
+        self.items = [None] * len(offsets)
+        self.index = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+
+        x = self.items[item]
+
+        if x is None:
+            b = BytesReader(self.view)
+            b.seek(self.offsets[item])
+            x = self.items[item] = Object.read(b)
+
+        return x
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, (list, LazyVector)) and list(self) == list(other)
+
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        # The buffer view can't be pickled: a lazy vector is pickled (and copied) as a regular list
+        return list, (list(self),)
+
+    def get_id(self, item: int) -> int or None:
+        """Get the "id" of an element without decoding it; None if its constructor has no id at a fixed offset"""
+        offset = self.offsets[item]
+        id_offset = self.id_offsets.get(int.from_bytes(self.view[offset:offset + 4], "little"))
+
+        if id_offset is None:
+            return None
+
+        offset += 4 + id_offset
+
+        return int.from_bytes(self.view[offset:offset + 4], "little", signed=True)
+
+    def ids(self) -> list:
+        return [self.get_id(i) for i in range(len(self))]
+
+    def by_id(self) -> "LazyIndex":
+        """A read-only mapping of the elements by id, decoding only those looked up"""
+        return LazyIndex(self)
+
+    def get_index(self) -> dict:
+        """Map ids to element positions; built on first use from the ids alone wherever possible"""
+        if self.index is None:
+            self.index = {}
+
+            for i in range(len(self)):
+                element_id = self.get_id(i)
+
+                # Constructors without an id at a fixed offset have to be decoded to be indexed
+                if element_id is None:
+                    element_id = getattr(self[i], "id", None)
+
+                if element_id is not None:
+                    self.index.setdefault(element_id, i)
+
+        return self.index
+
+    def get(self, id: int, default=None):
+        """Decode only the element with the given id (e.g.: a user or a chat)"""
+        i = self.get_index().get(id)
+
+        return default if i is None else self[i]
+
+
+class LazyIndex(Mapping):
+    __slots__ = ["vector"]
+
+    def __init__(self, vector: LazyVector):
+        self.vector = vector
+
+    def __getitem__(self, id: int):
+        i = self.vector.get_index().get(id)
+
+        if i is None:
+            raise KeyError(id)
+
+        return self.vector[i]
+
+    def __iter__(self):
+        return iter(self.vector.get_index())
+
+    def __len__(self) -> int:
+        return len(self.vector.get_index())
+
+
 class Vector(Object):
     ID = 0x1cb5c415
 
+    # Set to True to decode Vectors of boxed objects lazily, see LazyVector
+    LAZY = False
+
     # Method added to handle the special case when a query returns a bare Vector (of Ints);
     # i.e., RpcResult body starts with 0x1cb5c415 (Vector Id) - e.g., messages.GetMessagesViews.
     @staticmethod
     def _read(b: BytesIO) -> Object or int:
         try:
-            return Object.read(b)
+            return Object.readers[int.from_bytes(b.read(4), "little")](b)
         except KeyError:
             b.seek(-4, 1)
             return Int.read(b)
 
     @staticmethod
     def read(b: BytesIO, t: Object = None) -> list:
+        count = Int.read(b)
+
+        if Vector.LAZY and t is None and count and isinstance(b, BytesReader):
+            lazy = Vector._read_lazy(b, count)
+
+            if lazy is not None:
+                return lazy
+
         return [
             t.read(b) if t
             else Vector._read(b)
-            for _ in range(Int.read(b))
+            for _ in range(count)
         ]
 
+    @staticmethod
+    def _read_lazy(b: BytesReader, count: int) -> LazyVector or None:
+        start = b.offset
+        offsets = []
+
+        try:
+            for _ in range(count):
+                offsets.append(b.offset)
+                Object.skip(b)
+        except KeyError:
+            # Not a Vector of boxed objects (e.g.: a bare Vector of Ints), read it the usual way
+            b.offset = start
+            return None
+
+        return LazyVector(b.getbuffer(), offsets)
+
+    @staticmethod
+    def skip(b: BytesReader, t: Object = None):
+        for _ in range(Int.read(b)):
+            if t:
+                t.skip(b)
+            else:
+                try:
+                    Object.skip(b)
+                except KeyError:
+                    # A bare Int, whose 4 bytes have already been consumed
+                    pass
+
+    @staticmethod
+    def write_into(b: bytearray, value: list, t: Object = None):
+        b += Int(Vector.ID, False)
+        b += Int(len(value))
+
+        if t:
+            for i in value:
+                b += t(i)
+        else:
+            for i in value:
+                i.write_into(b)
+
     def __new__(cls, value: list, t: Object = None) -> bytes:
-        return b"".join(
-            [Int(cls.ID, False), Int(len(value))]
-            + [
-                t(i) if t
-                else i.write()
-                for i in value
-            ]
-        )
+        b = bytearray()
+        Vector.write_into(b, value, t)
+        return bytes(b)
@@ -52,7 +52,8 @@ from pyrogram.errors import (
     VolumeLocNotFound, UserMigrate, FileIdInvalid, ChannelPrivate, PhoneNumberOccupied,
     PasswordRecoveryNa, PasswordEmpty
 )
-from pyrogram.session import Auth, Session
+from pyrogram.session import Auth, Session, SessionPool, RetryPolicy
+from pyrogram.session.internals import EndpointCache
 from .ext.utils import ainput
 from .ext import utils, Syncer, BaseClient, Dispatcher
 from .methods import Methods
@@ -104,6 +105,7 @@ class Client(Methods, BaseClient):
             Your SOCKS5 Proxy settings as dict,
             e.g.: *dict(hostname="11.22.33.44", port=1080, username="user", password="pass")*.
             *username* and *password* can be omitted if your proxy doesn't require authorization.
+            Add *scheme="http"* to use an HTTP proxy (CONNECT method) instead.
             This is an alternative way to setup a proxy if you don't want to use the *config.ini* file.
 
         test_mode (``bool``, *optional*):
@@ -178,6 +180,11 @@ class Client(Methods, BaseClient):
             download_media, ...) are less prone to throw FloodWait exceptions.
             Only available for users, bots will ignore this parameter.
             Defaults to False (normal session).
+
+        sessions (``int``, *optional*):
+            Number of parallel connections to the main DC, all sharing the same authorization. Raw functions sent
+            with :meth:`send` are spread over them, while calls on the same chat always go through the same one.
+            Useful for bulk jobs, which are otherwise limited by a single connection. Defaults to 1.
     """
 
     terms_of_service_displayed = False
@@ -207,7 +214,8 @@ class Client(Methods, BaseClient):
         config_file: str = BaseClient.CONFIG_FILE,
         plugins: dict = None,
         no_updates: bool = None,
-        takeout: bool = None
+        takeout: bool = None,
+        sessions: int = BaseClient.SESSIONS
     ):
         super().__init__()
 
@@ -236,6 +244,7 @@ class Client(Methods, BaseClient):
         self.plugins = plugins
         self.no_updates = no_updates
         self.takeout = takeout
+        self.sessions = sessions
         self.load_session_hook = None
         self.save_session_hook = None
 
@@ -343,6 +352,10 @@ class Client(Methods, BaseClient):
             await self.session.stop()
             raise e
 
+        if self.sessions > 1:
+            self.session_pool = SessionPool(self.session, self.sessions)
+            await self.session_pool.start()
+
         self.updates_worker_task = asyncio.ensure_future(self.updates_worker())
 
         for _ in range(Client.DOWNLOAD_WORKERS):
@@ -386,7 +399,7 @@ class Client(Methods, BaseClient):
 
         log.info("Stopped {} DownloadWorkerTasks".format(Client.DOWNLOAD_WORKERS))
 
-        self.updates_queue.put_nowait(None)
+        await self.updates_queue.put(None)
         await self.updates_worker_task
 
         for media_session in self.media_sessions.values():
@@ -394,6 +407,10 @@ class Client(Methods, BaseClient):
 
         self.media_sessions.clear()
 
+        if self.session_pool is not None:
+            await self.session_pool.stop()
+            self.session_pool = None
+
         self.is_started = False
         await self.session.stop()
 
@@ -1028,12 +1045,135 @@ class Client(Methods, BaseClient):
             except Exception as e:
                 log.error(e, exc_info=True)
 
+            if self.updates_gaps and self.updates_queue.empty():
+                await self.fill_updates_gaps()
+
         log.info("UpdatesWorkerTask stopped")
 
+    def updates_overflow(self, updates):
+        # Sessions drop the updates that don't fit in a full updates queue. Only the position of the first lost
+        # update of each sequence is kept: everything from there on is fetched again with getDifference once the
+        # updates worker has caught up. Updates without pts (e.g.: user statuses) can't be recovered and are lost
+        if isinstance(updates, (types.Update, types.UpdatesCombined, types.UpdateShort)):
+            date = updates.date
+            items = getattr(updates, "updates", [getattr(updates, "update", None)])
+        elif isinstance(updates, (types.UpdateShortMessage, types.UpdateShortChatMessage)):
+            date = updates.date
+            items = [updates]
+        else:
+            log.warning("Updates queue full, dropped {}".format(type(updates).__name__))
+            return
+
+        for update in items:
+            pts = getattr(update, "pts", None)
+
+            if pts is None:
+                continue
+
+            channel_id = getattr(
+                getattr(
+                    getattr(
+                        update, "message", None
+                    ), "to_id", None
+                ), "channel_id", None
+            ) or getattr(update, "channel_id", None)
+
+            gap = (pts - getattr(update, "pts_count", 0), date)
+
+            if channel_id not in self.updates_gaps or gap < self.updates_gaps[channel_id]:
+                if not self.updates_gaps:
+                    log.warning("Updates queue full, dropping updates until the updates worker catches up")
+
+                self.updates_gaps[channel_id] = gap
+
+    async def fill_updates_gaps(self):
+        gaps, self.updates_gaps = self.updates_gaps, {}
+
+        for channel_id, (pts, date) in gaps.items():
+            try:
+                if channel_id is None:
+                    await self.get_difference(pts, date)
+                else:
+                    await self.get_channel_difference(channel_id, pts)
+            except Exception as e:
+                log.error(e, exc_info=True)
+
+    async def get_difference(self, pts: int, date: int):
+        while True:
+            diff = await self.send(functions.updates.GetDifference(pts=pts, date=date, qts=-1))
+
+            if isinstance(diff, types.updates.DifferenceEmpty):
+                break
+
+            if isinstance(diff, types.updates.DifferenceTooLong):
+                log.warning(diff)
+                break
+
+            state = diff.state if isinstance(diff, types.updates.Difference) else diff.intermediate_state
+
+            self.fetch_peers(diff.users)
+            self.fetch_peers(diff.chats)
+
+            for message in diff.new_messages:
+                self.dispatcher.updates_queue.put_nowait((
+                    types.UpdateNewMessage(message=message, pts=state.pts, pts_count=0),
+                    diff.users,
+                    diff.chats
+                ))
+
+            for update in diff.other_updates:
+                self.dispatcher.updates_queue.put_nowait((update, diff.users, diff.chats))
+
+            if isinstance(diff, types.updates.Difference):
+                break
+
+            pts, date = state.pts, state.date
+
+    async def get_channel_difference(self, channel_id: int, pts: int):
+        channel = await self.resolve_peer(int("-100" + str(channel_id)))
+
+        while True:
+            diff = await self.send(
+                functions.updates.GetChannelDifference(
+                    channel=channel,
+                    filter=types.ChannelMessagesFilterEmpty(),
+                    pts=pts,
+                    limit=100
+                )
+            )
+
+            if isinstance(diff, types.updates.ChannelDifferenceEmpty):
+                break
+
+            if isinstance(diff, types.updates.ChannelDifferenceTooLong):
+                log.warning(diff)
+                break
+
+            self.fetch_peers(diff.users)
+            self.fetch_peers(diff.chats)
+
+            for message in diff.new_messages:
+                self.dispatcher.updates_queue.put_nowait((
+                    types.UpdateNewChannelMessage(message=message, pts=diff.pts, pts_count=0),
+                    diff.users,
+                    diff.chats
+                ))
+
+            for update in diff.other_updates:
+                self.dispatcher.updates_queue.put_nowait((update, diff.users, diff.chats))
+
+            if diff.final:
+                break
+
+            pts = diff.pts
+
     async def send(self,
                    data: Object,
                    retries: int = Session.MAX_RETRIES,
-                   timeout: float = Session.WAIT_TIMEOUT):
+                   timeout: float = Session.WAIT_TIMEOUT,
+                   retry_policy: RetryPolicy = None,
+                   key=None,
+                   priority: int = Session.PRIORITY_NORMAL):
         """Use this method to send Raw Function queries.
 
         This method makes possible to manually call every single Telegram API method in a low-level manner.
@@ -1050,6 +1190,20 @@ class Client(Methods, BaseClient):
             timeout (``float``):
                 Timeout in seconds.
 
+            retry_policy (:obj:`RetryPolicy <pyrogram.session.RetryPolicy>`, *optional*):
+                Custom retry strategy (backoff, per-error budgets, overall deadline).
+                When given, *retries* is ignored.
+
+            key (*optional*):
+                Any hashable value. When using multiple *sessions*, calls sharing the same key are always sent
+                through the same connection, which keeps them in order. Defaults to the id of the peer the function
+                targets, if any.
+
+            priority (``int``, *optional*):
+                Admission priority used when too many requests are in flight, one of *Session.PRIORITY_HIGH*,
+                *Session.PRIORITY_NORMAL* (default) or *Session.PRIORITY_LOW*. Pass a higher priority for interactive
+                calls and a lower one for bulk jobs. Requests that have waited long enough go first regardless.
+
         Raises:
             :class:`RPCError <pyrogram.RPCError>` in case of a Telegram RPC error.
         """
@@ -1062,7 +1216,10 @@ class Client(Methods, BaseClient):
         if self.takeout_id:
             data = functions.InvokeWithTakeout(takeout_id=self.takeout_id, query=data)
 
-        r = await self.session.send(data, retries, timeout)
+        if self.session_pool is not None:
+            r = await self.session_pool.send(data, retries, timeout, retry_policy, key, priority)
+        else:
+            r = await self.session.send(data, retries, timeout, retry_policy, priority)
 
         self.fetch_peers(getattr(r, "users", []))
         self.fetch_peers(getattr(r, "chats", []))
@@ -1109,6 +1266,7 @@ class Client(Methods, BaseClient):
                 self._proxy["port"] = parser.getint("proxy", "port")
                 self._proxy["username"] = parser.get("proxy", "username", fallback=None) or None
                 self._proxy["password"] = parser.get("proxy", "password", fallback=None) or None
+                self._proxy["scheme"] = parser.get("proxy", "scheme", fallback="socks5")
 
         if self.plugins:
             self.plugins["enabled"] = bool(self.plugins.get("enabled", True))
@@ -1152,6 +1310,8 @@ class Client(Methods, BaseClient):
             # TODO: replace default with False once token session name will be deprecated
             self.is_bot = s.get("is_bot", self.is_bot)
 
+            EndpointCache.load(s.get("endpoints", []))
+
             for k, v in s.get("peers_by_id", {}).items():
                 self.peers_by_id[int(k)] = utils.get_input_peer(int(k), v)
 
@@ -1286,6 +1446,7 @@ class Client(Methods, BaseClient):
                     user_id=self.user_id,
                     date=self.date,
                     is_bot=self.is_bot,
+                    endpoints=EndpointCache.dump()
                 ),
                 f,
                 indent=4
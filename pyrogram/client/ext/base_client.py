@@ -47,9 +47,11 @@ class BaseClient:
     BOT_TOKEN_RE = re.compile(r"^\d+:[\w-]+$")
     DIALOGS_AT_ONCE = 100
     UPDATES_WORKERS = 1
+    UPDATES_QUEUE_SIZE = 0  # Unbounded; with a positive size, updates that don't fit are fetched again later
     DOWNLOAD_WORKERS = 4
     OFFLINE_SLEEP = 300
     WORKERS = 4
+    SESSIONS = 1
     WORKDIR = "."
     CONFIG_FILE = "./config.ini"
 
@@ -84,6 +86,7 @@ class BaseClient:
         self.html = HTML(self)
 
         self.session = None
+        self.session_pool = None
         self.media_sessions = {}
         self.media_sessions_lock = asyncio.Lock()
 
@@ -92,7 +95,8 @@ class BaseClient:
 
         self.takeout_id = None
 
-        self.updates_queue = asyncio.Queue()
+        self.updates_queue = asyncio.Queue(self.UPDATES_QUEUE_SIZE)
+        self.updates_gaps = {}  # channel_id (None for the common sequence) -> (pts, date) of the first update lost
         self.updates_worker_task = None
         self.download_queue = asyncio.Queue()
         self.download_worker_tasks = []
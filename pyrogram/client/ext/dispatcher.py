@@ -22,6 +22,7 @@ from collections import OrderedDict
 
 import pyrogram
 from pyrogram.api import types
+from . import utils
 from ..handlers import (
     CallbackQueryHandler, MessageHandler, DeletedMessagesHandler,
     UserStatusHandler, RawUpdateHandler, InlineQueryHandler
@@ -126,8 +127,8 @@ class Dispatcher:
                 break
 
             try:
-                users = {i.id: i for i in update[1]}
-                chats = {i.id: i for i in update[2]}
+                users = utils.index_by_id(update[1])
+                chats = utils.index_by_id(update[2])
                 update = update[0]
 
                 parser = self.update_parsers.get(type(update), None)
@@ -25,6 +25,7 @@ import shutil
 import time
 
 from . import utils
+from ...session.internals import EndpointCache
 
 log = logging.getLogger(__name__)
 
@@ -104,7 +105,8 @@ class Syncer:
                 peers_by_phone={
                     k: utils.get_peer_id(v)
                     for k, v in client.peers_by_phone.copy().items()
-                }
+                },
+                endpoints=EndpointCache.dump()
             )
 
             os.makedirs(client.workdir, exist_ok=True)
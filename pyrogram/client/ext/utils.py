@@ -22,6 +22,7 @@ from base64 import b64decode, b64encode
 from concurrent.futures.thread import ThreadPoolExecutor
 
 from ...api import types
+from ...api.core import LazyVector
 
 
 def decode(s: str) -> bytes:
@@ -94,3 +95,11 @@ def get_offset_date(dialogs):
             return m.date
     else:
         return 0
+
+
+def index_by_id(objects) -> dict:
+    # Users and chats from lazily decoded vectors (see Vector.LAZY) are only decoded when looked up
+    if isinstance(objects, LazyVector):
+        return objects.by_id()
+
+    return {i.id: i for i in objects}
@@ -18,6 +18,7 @@
 
 from pyrogram.api import functions
 from pyrogram.client.ext import BaseClient
+from pyrogram.session import Session
 
 
 class AnswerCallbackQuery(BaseClient):
@@ -66,5 +67,7 @@ class AnswerCallbackQuery(BaseClient):
                 alert=show_alert or None,
                 message=text,
                 url=url
-            )
+            ),
+            # Callback answers are awaited by the user, don't let them queue behind bulk requests
+            priority=Session.PRIORITY_HIGH
         )
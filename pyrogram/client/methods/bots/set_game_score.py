@@ -20,7 +20,7 @@ from typing import Union
 
 import pyrogram
 from pyrogram.api import functions, types
-from pyrogram.client.ext import BaseClient
+from pyrogram.client.ext import BaseClient, utils
 
 
 class SetGameScore(BaseClient):
@@ -85,8 +85,8 @@ class SetGameScore(BaseClient):
             if isinstance(i, (types.UpdateEditMessage, types.UpdateEditChannelMessage)):
                 return await pyrogram.Message._parse(
                     self, i.message,
-                    {i.id: i for i in r.users},
-                    {i.id: i for i in r.chats}
+                    utils.index_by_id(r.users),
+                    utils.index_by_id(r.chats)
                 )
 
         return True
@@ -21,7 +21,7 @@ from typing import Union
 import pyrogram
 from pyrogram.api import functions, types
 from pyrogram.errors import UserNotParticipant
-from ...ext import BaseClient
+from ...ext import BaseClient, utils
 
 
 class GetChatMember(BaseClient):
@@ -70,7 +70,7 @@ class GetChatMember(BaseClient):
                 )
             )
 
-            users = {i.id: i for i in r.users}
+            users = utils.index_by_id(r.users)
 
             return pyrogram.ChatMember._parse(self, r.participant, users)
         else:
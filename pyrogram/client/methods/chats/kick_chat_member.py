@@ -20,7 +20,7 @@ from typing import Union
 
 import pyrogram
 from pyrogram.api import functions, types
-from ...ext import BaseClient
+from ...ext import BaseClient, utils
 
 
 class KickChatMember(BaseClient):
@@ -92,8 +92,8 @@ class KickChatMember(BaseClient):
             if isinstance(i, (types.UpdateNewMessage, types.UpdateNewChannelMessage)):
                 return await pyrogram.Message._parse(
                     self, i.message,
-                    {i.id: i for i in r.users},
-                    {i.id: i for i in r.chats}
+                    utils.index_by_id(r.users),
+                    utils.index_by_id(r.chats)
                 )
         else:
             return True
@@ -361,6 +361,6 @@ class EditMessageMedia(BaseClient):
             if isinstance(i, (types.UpdateEditMessage, types.UpdateEditChannelMessage)):
                 return await pyrogram.Message._parse(
                     self, i.message,
-                    {i.id: i for i in r.users},
-                    {i.id: i for i in r.chats}
+                    utils.index_by_id(r.users),
+                    utils.index_by_id(r.chats)
                 )
@@ -20,7 +20,7 @@ from typing import Union, Iterable
 
 import pyrogram
 from pyrogram.api import functions, types
-from ...ext import BaseClient
+from ...ext import BaseClient, utils
 
 
 class ForwardMessages(BaseClient):
@@ -110,8 +110,8 @@ class ForwardMessages(BaseClient):
 
             forwarded_messages = []
 
-            users = {i.id: i for i in r.users}
-            chats = {i.id: i for i in r.chats}
+            users = utils.index_by_id(r.users)
+            chats = utils.index_by_id(r.chats)
 
             for i in r.updates:
                 if isinstance(i, (types.UpdateNewMessage, types.UpdateNewChannelMessage)):
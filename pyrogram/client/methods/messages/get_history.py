@@ -23,6 +23,7 @@ from typing import Union
 import pyrogram
 from pyrogram.api import functions
 from pyrogram.errors import FloodWait
+from pyrogram.session import Session
 from ...ext import BaseClient
 
 log = logging.getLogger(__name__)
@@ -87,7 +88,8 @@ class GetHistory(BaseClient):
                             max_id=0,
                             min_id=0,
                             hash=0
-                        )
+                        ),
+                        priority=Session.PRIORITY_LOW
                     )
                 )
             except FloodWait as e:
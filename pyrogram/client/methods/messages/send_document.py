@@ -177,8 +177,8 @@ class SendDocument(BaseClient):
                         if isinstance(i, (types.UpdateNewMessage, types.UpdateNewChannelMessage)):
                             return await pyrogram.Message._parse(
                                 self, i.message,
-                                {i.id: i for i in r.users},
-                                {i.id: i for i in r.chats}
+                                utils.index_by_id(r.users),
+                                utils.index_by_id(r.chats)
                             )
         except BaseClient.StopTransmission:
             return None
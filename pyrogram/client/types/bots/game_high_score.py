@@ -19,6 +19,7 @@
 import pyrogram
 
 from pyrogram.api import types
+from pyrogram.client.ext.utils import index_by_id
 from pyrogram.client.types.pyrogram_type import PyrogramType
 from pyrogram.client.types.user_and_chats import User
 
@@ -55,7 +56,7 @@ class GameHighScore(PyrogramType):
 
     @staticmethod
     def _parse(client, game_high_score: types.HighScore, users: dict) -> "GameHighScore":
-        users = {i.id: i for i in users}
+        users = index_by_id(users)
 
         return GameHighScore(
             user=User._parse(client, users[game_high_score.user_id]),
@@ -20,6 +20,7 @@ from typing import List, Union
 
 import pyrogram
 from pyrogram.api import types
+from ...ext.utils import index_by_id
 from .message import Message
 from ..pyrogram_type import PyrogramType
 from ..update import Update
@@ -53,8 +54,8 @@ class Messages(PyrogramType, Update):
 
     @staticmethod
     async def _parse(client, messages: types.messages.Messages, replies: int = 1) -> "Messages":
-        users = {i.id: i for i in messages.users}
-        chats = {i.id: i for i in messages.chats}
+        users = index_by_id(messages.users)
+        chats = index_by_id(messages.chats)
 
         total_count = getattr(messages, "count", len(messages.messages))
 
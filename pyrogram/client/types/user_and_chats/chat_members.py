@@ -20,6 +20,7 @@ from typing import List
 
 import pyrogram
 from pyrogram.api import types
+from ...ext.utils import index_by_id
 from .chat_member import ChatMember
 from ..pyrogram_type import PyrogramType
 
@@ -51,7 +52,7 @@ class ChatMembers(PyrogramType):
 
     @staticmethod
     def _parse(client, members):
-        users = {i.id: i for i in members.users}
+        users = index_by_id(members.users)
         chat_members = []
 
         if isinstance(members, types.channels.ChannelParticipants):
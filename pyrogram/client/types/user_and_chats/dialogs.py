@@ -20,6 +20,7 @@ from typing import List
 
 import pyrogram
 from pyrogram.api import types
+from ...ext.utils import index_by_id
 from .dialog import Dialog
 from ..messages_and_media import Message
 from ..pyrogram_type import PyrogramType
@@ -52,8 +53,8 @@ class Dialogs(PyrogramType):
 
     @staticmethod
     async def _parse(client, dialogs) -> "Dialogs":
-        users = {i.id: i for i in dialogs.users}
-        chats = {i.id: i for i in dialogs.chats}
+        users = index_by_id(dialogs.users)
+        chats = index_by_id(dialogs.chats)
 
         messages = {}
 
@@ -18,9 +18,10 @@
 
 import asyncio
 import logging
+from time import monotonic
 
 from .transport import *
-from ..session.internals import DataCenter
+from ..session.internals import EndpointCache
 
 log = logging.getLogger(__name__)
 
@@ -28,6 +29,10 @@ log = logging.getLogger(__name__)
 class Connection:
     MAX_RETRIES = 3
 
+    # Endpoints are raced happy-eyeballs style: a new connection attempt starts every
+    # STAGGER seconds (or as soon as the previous one fails), the first to succeed wins
+    STAGGER = 0.25
+
     MODES = {
         0: TCPFull,
         1: TCPAbridged,
@@ -38,28 +43,28 @@ class Connection:
 
     def __init__(self, dc_id: int, test_mode: bool, ipv6: bool, proxy: dict, mode: int = 3):
         self.dc_id = dc_id
+        self.test_mode = test_mode
         self.ipv6 = ipv6
         self.proxy = proxy
-        self.address = DataCenter(dc_id, test_mode, ipv6)
+        self.address = None
         self.mode = self.MODES.get(mode, TCPAbridged)
 
         self.protocol = None  # type: TCP
 
     async def connect(self):
         for i in range(Connection.MAX_RETRIES):
-            self.protocol = self.mode(self.ipv6, self.proxy)
-
             try:
                 log.info("Connecting...")
-                await self.protocol.connect(self.address)
+                self.protocol, self.address = await self.race(
+                    EndpointCache.get(self.dc_id, self.test_mode, self.ipv6)
+                )
             except OSError as e:
                 log.warning(e)  # TODO: Remove
-                self.protocol.close()
                 await asyncio.sleep(1)
             else:
-                log.info("Connected! DC{} - IPv{} - {}".format(
+                log.info("Connected! DC{} - {}:{} - {}".format(
                     self.dc_id,
-                    "6" if self.ipv6 else "4",
+                    *self.address,
                     self.mode.__name__
                 ))
                 break
@@ -67,15 +72,70 @@ class Connection:
             log.warning("Connection failed! Trying again...")
             raise TimeoutError
 
+    async def attempt(self, protocol: TCP, address: tuple):
+        start = monotonic()
+
+        try:
+            await protocol.connect(address)
+        except OSError:
+            EndpointCache.record(self.dc_id, self.test_mode, address, None)
+            raise
+        else:
+            EndpointCache.record(self.dc_id, self.test_mode, address, monotonic() - start)
+
+    async def race(self, addresses: list) -> tuple:
+        attempts = {}
+        pending = set()
+        result = None
+        error = OSError("No address to connect to")
+
+        try:
+            for address in addresses + [None]:
+                if address is not None:
+                    protocol = self.mode(self.ipv6, self.proxy)
+                    task = asyncio.ensure_future(self.attempt(protocol, address))
+
+                    attempts[task] = (protocol, address)
+                    pending.add(task)
+
+                # Once every attempt has started, wait for the remaining ones to finish
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=self.STAGGER if address is not None else None,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                    for task in done:
+                        if task.exception() is None:
+                            result = attempts[task]
+                            return result
+
+                        error = task.exception()
+
+                    if address is not None:
+                        break
+
+            raise error
+        finally:
+            for task, (protocol, _) in attempts.items():
+                if attempts[task] is not result:
+                    task.cancel()
+                    protocol.close()
+
     def close(self):
-        self.protocol.close()
+        if self.protocol is not None:
+            self.protocol.close()
         log.info("Disconnected")
 
-    async def send(self, data: bytes):
+    async def send(self, data: bytes or list):
         try:
             await self.protocol.send(data)
         except Exception:
             raise OSError
 
-    async def recv(self) -> bytes or None:
-        return await self.protocol.recv()
+    async def recv(self, timeout: float = None) -> bytes or None:
+        try:
+            return await asyncio.wait_for(self.protocol.recv(), timeout)
+        except asyncio.TimeoutError:
+            return None
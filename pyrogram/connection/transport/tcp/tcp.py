@@ -20,97 +20,257 @@ import asyncio
 import ipaddress
 import logging
 import socket
+from base64 import b64encode
+from collections import deque
 
-try:
-    import socks
-except ImportError as e:
-    e.msg = (
-        "PySocks is missing and Pyrogram can't run without. "
-        "Please install it using \"pip3 install pysocks\"."
-    )
+log = logging.getLogger(__name__)
 
-    raise e
 
-log = logging.getLogger(__name__)
+class TCP(asyncio.Protocol):
+    """Abstract base of all transports.
+
+    Incoming bytes are collected in a single receive buffer as soon as they arrive (see :meth:`data_received`) and
+    complete frames are cut out of it by ``unpack(buffer, offset)``, which each framing must implement: it returns
+    the size of the frame starting at *offset* together with its payload, or (0, None) if the frame is still
+    incomplete. A None payload for a complete frame marks it as invalid and closes the connection.
 
+    Outgoing frames are handed over as lists of buffers (header, payload, ...) so that large payloads are never copied
+    just to be prefixed with a header: while the transport has nothing queued they are written straight to the socket
+    with a single scatter/gather sendmsg() call, and only what the socket doesn't take right away is handed to the
+    transport (whose writelines() joins the buffers into a single copy before Python 3.12). Writers only wait for the
+    transport to drain once its buffer grows past WRITE_BUFFER_LIMIT.
+    """
 
-class TCP:
     TIMEOUT = 10
+    WRITE_BUFFER_LIMIT = 1024 * 1024
+    SENDMSG = hasattr(socket.socket, "sendmsg")  # Not available on Windows
 
     def __init__(self, ipv6: bool, proxy: dict):
         self.socket = None
+        self.transport = None  # type: asyncio.Transport
 
-        self.reader = None  # type: asyncio.StreamReader
-        self.writer = None  # type: asyncio.StreamWriter
-
-        self.lock = asyncio.Lock()
-
-        if proxy.get("enabled", False):
-            hostname = proxy.get("hostname", None)
-            port = proxy.get("port", None)
-
-            try:
-                ip_address = ipaddress.ip_address(hostname)
-            except ValueError:
-                self.socket = socks.socksocket(socket.AF_INET)
-            else:
-                if isinstance(ip_address, ipaddress.IPv6Address):
-                    self.socket = socks.socksocket(socket.AF_INET6)
-                else:
-                    self.socket = socks.socksocket(socket.AF_INET)
-
-            self.socket.set_proxy(
-                proxy_type=socks.SOCKS5,
-                addr=hostname,
-                port=port,
-                username=proxy.get("username", None),
-                password=proxy.get("password", None)
-            )
+        self.buffer = bytearray()
+        self.packets = deque()
+        self.waiter = None  # type: asyncio.Future
+        self.is_closed = False
+
+        self.can_write = asyncio.Event()
+        self.can_write.set()
+
+        self.ipv6 = ipv6
+        self.proxy = proxy if proxy.get("enabled", False) else None
+
+    async def connect(self, address: tuple):
+        loop = asyncio.get_event_loop()
+
+        if self.proxy is not None:
+            hostname = self.proxy.get("hostname", None)
+            port = self.proxy.get("port", None)
 
             log.info("Using proxy {}:{}".format(hostname, port))
         else:
-            self.socket = socks.socksocket(
-                socket.AF_INET6 if ipv6
-                else socket.AF_INET
-            )
+            hostname, port = address
 
-        self.socket.settimeout(TCP.TIMEOUT)
+        try:
+            family, socket_type, proto, _, sockaddr = (
+                await loop.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+            )[0]
 
-    async def connect(self, address: tuple):
-        self.socket.connect(address)
-        self.reader, self.writer = await asyncio.open_connection(sock=self.socket)
+            self.socket = socket.socket(family, socket_type, proto)
+            self.socket.setblocking(False)
+
+            await asyncio.wait_for(loop.sock_connect(self.socket, sockaddr), TCP.TIMEOUT)
+
+            if self.proxy is not None:
+                await asyncio.wait_for(
+                    self.http_connect(address)
+                    if self.proxy.get("scheme", "socks5").lower() == "http"
+                    else self.socks5(address),
+                    TCP.TIMEOUT
+                )
+        except asyncio.TimeoutError:
+            raise TimeoutError("Connection timed out") from None
+
+        await loop.create_connection(lambda: self, sock=self.socket)
+
+    async def socks5(self, address: tuple):
+        username = self.proxy.get("username", None)
+        password = self.proxy.get("password", None)
+
+        # Offer username/password authentication (0x02) only when credentials are given
+        await self.sendall(b"\x05\x02\x00\x02" if username else b"\x05\x01\x00")
+        version, method = await self.recvall(2)
+
+        if version != 5 or method not in (0, 2):
+            raise ConnectionError("SOCKS5 proxy accepted none of the authentication methods")
+
+        if method == 2:
+            username = username.encode()
+            password = (password or "").encode()
+
+            await self.sendall(b"\x01" + bytes([len(username)]) + username + bytes([len(password)]) + password)
+
+            if (await self.recvall(2))[1] != 0:
+                raise ConnectionError("SOCKS5 proxy authentication failed")
+
+        hostname, port = address
 
-    def close(self):
         try:
-            self.writer.close()
-        except AttributeError:
-            try:
-                self.socket.shutdown(socket.SHUT_RDWR)
-            except OSError:
-                pass
-            finally:
-                self.socket.close()
-
-    async def send(self, data: bytes):
-        with await self.lock:
-            self.writer.write(data)
-            await self.writer.drain()
-
-    async def recv(self, length: int = 0):
+            ip_address = ipaddress.ip_address(hostname)
+        except ValueError:
+            hostname = hostname.encode()
+            destination = b"\x03" + bytes([len(hostname)]) + hostname
+        else:
+            destination = (b"\x04" if ip_address.version == 6 else b"\x01") + ip_address.packed
+
+        await self.sendall(b"\x05\x01\x00" + destination + port.to_bytes(2, "big"))
+        _, reply, _, address_type = await self.recvall(4)
+
+        if reply != 0:
+            raise ConnectionError("SOCKS5 proxy failed to connect (error {})".format(reply))
+
+        # Skip the bound address and port
+        if address_type == 3:
+            await self.recvall((await self.recvall(1))[0] + 2)
+        else:
+            await self.recvall((16 if address_type == 4 else 4) + 2)
+
+    async def http_connect(self, address: tuple):
+        hostname, port = address
+        username = self.proxy.get("username", None)
+        password = self.proxy.get("password", None)
+
+        if ":" in hostname:
+            hostname = "[{}]".format(hostname)
+
+        request = "CONNECT {0}:{1} HTTP/1.1\r\nHost: {0}:{1}\r\n".format(hostname, port)
+
+        if username:
+            request += "Proxy-Authorization: Basic {}\r\n".format(
+                b64encode("{}:{}".format(username, password or "").encode()).decode()
+            )
+
+        await self.sendall((request + "\r\n").encode())
+
+        response = b""
+
+        # Read one byte at a time to never consume anything past the response headers
+        while not response.endswith(b"\r\n\r\n"):
+            response += await self.recvall(1)
+
+        status = response.split(b"\r\n", 1)[0].split()
+
+        if len(status) < 2 or status[1] != b"200":
+            raise ConnectionError("HTTP proxy failed to connect ({})".format(b" ".join(status[1:]).decode()))
+
+    async def sendall(self, data: bytes):
+        await asyncio.get_event_loop().sock_sendall(self.socket, data)
+
+    async def recvall(self, length: int) -> bytes:
         data = b""
 
         while len(data) < length:
-            try:
-                chunk = await asyncio.wait_for(
-                    self.reader.read(length - len(data)),
-                    TCP.TIMEOUT
-                )
-            except (OSError, asyncio.TimeoutError):
-                return None
-            else:
-                if chunk:
-                    data += chunk
-                else:
-                    return None
+            chunk = await asyncio.get_event_loop().sock_recv(self.socket, length - len(data))
+
+            if not chunk:
+                raise ConnectionError("Proxy closed the connection")
+
+            data += chunk
 
         return data
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        elif self.socket is not None:
+            self.socket.close()
+
+    async def send(self, data: bytes or list):
+        if self.is_closed:
+            raise ConnectionError("Connection closed")
+
+        buffers = self.buffers(data)
+
+        if self.SENDMSG and not self.transport.get_write_buffer_size() and not self.transport.is_closing():
+            buffers = self.sendmsg(buffers)
+
+        if buffers:
+            self.transport.writelines(buffers)
+
+        await self.can_write.wait()
+
+    def sendmsg(self, buffers: list) -> list:
+        """Write as much as the socket takes right away and return the buffers (or parts of) left to write."""
+        try:
+            sent = self.socket.sendmsg(buffers)
+        except OSError:
+            # Would block, or a real error that the transport reports once it tries to write the same buffers
+            return buffers
+
+        for i, buffer in enumerate(buffers):
+            buffer = memoryview(buffer)
+
+            if sent < buffer.nbytes:
+                return [buffer[sent:]] + buffers[i + 1:]
+
+            sent -= buffer.nbytes
+
+        return []
+
+    async def recv(self) -> bytes or None:
+        while not self.packets:
+            if self.is_closed:
+                return None
+
+            self.waiter = asyncio.get_event_loop().create_future()
+            await self.waiter
+
+        return self.packets.popleft()
+
+    def decode(self, buffer: bytearray, offset: int):
+        """Transform the bytes received from *offset* onwards in place, before any frame is parsed out of them."""
+
+    @staticmethod
+    def buffers(data: bytes or list) -> list:
+        return [data] if isinstance(data, (bytes, bytearray, memoryview)) else list(data)
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self.transport.set_write_buffer_limits(self.WRITE_BUFFER_LIMIT)
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        self.decode(self.buffer, len(self.buffer) - len(data))
+        offset = 0
+
+        while True:
+            size, packet = self.unpack(self.buffer, offset)
+
+            if not size:
+                break
+
+            offset += size
+            self.packets.append(packet)
+
+            if packet is None:
+                self.transport.close()
+                break
+
+        # Deleting from the front of a bytearray doesn't move the remaining bytes
+        del self.buffer[:offset]
+        self.wake()
+
+    def connection_lost(self, exc: Exception or None):
+        self.is_closed = True
+        self.can_write.set()
+        self.wake()
+
+    def pause_writing(self):
+        self.can_write.clear()
+
+    def resume_writing(self):
+        self.can_write.set()
@@ -31,26 +31,34 @@ class TCPAbridged(TCP):
         await super().connect(address)
         await super().send(b"\xef")
 
-    async def send(self, data: bytes, *args):
-        length = len(data) // 4
+    async def send(self, data: bytes or list, *args):
+        buffers = self.buffers(data)
+        length = sum(map(len, buffers)) // 4
 
         await super().send(
-            (bytes([length])
+            [bytes([length])
              if length <= 126
-             else b"\x7f" + length.to_bytes(3, "little"))
-            + data
+             else b"\x7f" + length.to_bytes(3, "little")]
+            + buffers
         )
 
-    async def recv(self, length: int = 0) -> bytes or None:
-        length = await super().recv(1)
+    def unpack(self, buffer: bytearray, offset: int) -> tuple:
+        if len(buffer) - offset < 1:
+            return 0, None
 
-        if length is None:
-            return None
+        header = 1
+        length = buffer[offset]
 
-        if length == b"\x7f":
-            length = await super().recv(3)
+        if length == 0x7f:
+            if len(buffer) - offset < 4:
+                return 0, None
 
-            if length is None:
-                return None
+            header = 4
+            length = int.from_bytes(buffer[offset + 1:offset + 4], "little")
 
-        return await super().recv(int.from_bytes(length, "little") * 4)
+        size = header + length * 4
+
+        if len(buffer) - offset < size:
+            return 0, None
+
+        return size, buffer[offset + header:offset + size]
@@ -20,7 +20,7 @@ import logging
 import os
 
 from .tcp import TCP
-from ....crypto.aes import AES
+from ....crypto import CTR256
 
 log = logging.getLogger(__name__)
 
@@ -46,45 +46,48 @@ class TCPAbridgedO(TCP):
 
         temp = bytearray(nonce[55:7:-1])
 
-        self.encrypt = (nonce[8:40], nonce[40:56], bytearray(1))
-        self.decrypt = (temp[0:32], temp[32:48], bytearray(1))
+        self.encrypt = CTR256(nonce[8:40], nonce[40:56])
+        self.decrypt = CTR256(temp[0:32], temp[32:48])
 
-        nonce[56:64] = AES.ctr256_encrypt(nonce, *self.encrypt)[56:64]
+        nonce[56:64] = self.encrypt(nonce)[56:64]
 
         await super().send(nonce)
 
-    async def send(self, data: bytes, *args):
-        length = len(data) // 4
+    async def send(self, data: bytes or list, *args):
+        buffers = self.buffers(data)
+        length = sum(map(len, buffers)) // 4
 
+        # The cipher state carries over from one call to the next, so each buffer can be encrypted on its own (into a
+        # new object: ciphertext can't share memory with the caller's plaintext)
         await super().send(
-            AES.ctr256_encrypt(
-                (bytes([length])
-                 if length <= 126
-                 else b"\x7f" + length.to_bytes(3, "little"))
-                + data,
-                *self.encrypt
-            )
+            [self.encrypt(buffer)
+             for buffer in [bytes([length])
+                            if length <= 126
+                            else b"\x7f" + length.to_bytes(3, "little")] + buffers]
         )
 
-    async def recv(self, length: int = 0) -> bytes or None:
-        length = await super().recv(1)
+    def decode(self, buffer: bytearray, offset: int):
+        # CTR is a stream cipher: incoming chunks are decrypted within the receive buffer as they arrive, regardless of
+        # frame boundaries (see CTR256.transform for the copy this involves)
+        self.decrypt.transform(buffer, offset)
 
-        if length is None:
-            return None
+    def unpack(self, buffer: bytearray, offset: int) -> tuple:
+        if len(buffer) - offset < 1:
+            return 0, None
 
-        length = AES.ctr256_decrypt(length, *self.decrypt)
+        header = 1
+        length = buffer[offset]
 
-        if length == b"\x7f":
-            length = await super().recv(3)
+        if length == 0x7f:
+            if len(buffer) - offset < 4:
+                return 0, None
 
-            if length is None:
-                return None
+            header = 4
+            length = int.from_bytes(buffer[offset + 1:offset + 4], "little")
 
-            length = AES.ctr256_decrypt(length, *self.decrypt)
+        size = header + length * 4
 
-        data = await super().recv(int.from_bytes(length, "little") * 4)
+        if len(buffer) - offset < size:
+            return 0, None
 
-        if data is None:
-            return None
-
-        return AES.ctr256_decrypt(data, *self.decrypt)
+        return size, buffer[offset + header:offset + size]
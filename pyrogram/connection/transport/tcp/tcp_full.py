@@ -18,7 +18,7 @@
 
 import logging
 from binascii import crc32
-from struct import pack, unpack
+from struct import pack, unpack_from
 
 from .tcp import TCP
 
@@ -35,29 +35,34 @@ class TCPFull(TCP):
         await super().connect(address)
         self.seq_no = 0
 
-    async def send(self, data: bytes, *args):
-        data = pack("<II", len(data) + 12, self.seq_no) + data
-        data += pack("<I", crc32(data))
+    async def send(self, data: bytes or list, *args):
+        buffers = self.buffers(data)
+        buffers.insert(0, pack("<II", sum(map(len, buffers)) + 12, self.seq_no))
+        checksum = 0
+
+        for buffer in buffers:
+            checksum = crc32(buffer, checksum)
+
+        buffers.append(pack("<I", checksum))
         self.seq_no += 1
 
-        await super().send(data)
+        await super().send(buffers)
 
-    async def recv(self, length: int = 0) -> bytes or None:
-        length = await super().recv(4)
+    def unpack(self, buffer: bytearray, offset: int) -> tuple:
+        if len(buffer) - offset < 4:
+            return 0, None
 
-        if length is None:
-            return None
+        size = unpack_from("<I", buffer, offset)[0]
 
-        packet = await super().recv(unpack("<I", length)[0] - 4)
+        if size < 12:
+            return 4, None
 
-        if packet is None:
-            return None
+        if len(buffer) - offset < size:
+            return 0, None
 
-        packet = length + packet
-        checksum = packet[-4:]
-        packet = packet[:-4]
+        packet = buffer[offset:offset + size - 4]
 
-        if crc32(packet) != unpack("<I", checksum)[0]:
-            return None
+        if crc32(packet) != unpack_from("<I", buffer, offset + size - 4)[0]:
+            return size, None
 
-        return packet[8:]
+        return size, packet[8:]
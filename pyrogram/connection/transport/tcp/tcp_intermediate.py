@@ -17,7 +17,7 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
-from struct import pack, unpack
+from struct import pack, unpack_from
 
 from .tcp import TCP
 
@@ -32,13 +32,21 @@ class TCPIntermediate(TCP):
         await super().connect(address)
         await super().send(b"\xee" * 4)
 
-    async def send(self, data: bytes, *args):
-        await super().send(pack("<i", len(data)) + data)
+    async def send(self, data: bytes or list, *args):
+        buffers = self.buffers(data)
 
-    async def recv(self, length: int = 0) -> bytes or None:
-        length = await super().recv(4)
+        await super().send([pack("<i", sum(map(len, buffers)))] + buffers)
 
-        if length is None:
-            return None
+    def unpack(self, buffer: bytearray, offset: int) -> tuple:
+        if len(buffer) - offset < 4:
+            return 0, None
 
-        return await super().recv(unpack("<i", length)[0])
+        size = 4 + unpack_from("<i", buffer, offset)[0]
+
+        if size < 4:
+            return 4, None
+
+        if len(buffer) - offset < size:
+            return 0, None
+
+        return size, buffer[offset + 4:offset + size]
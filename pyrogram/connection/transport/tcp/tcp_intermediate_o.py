@@ -18,10 +18,10 @@
 
 import logging
 import os
-from struct import pack, unpack
+from struct import pack, unpack_from
 
 from .tcp import TCP
-from ....crypto.aes import AES
+from ....crypto import CTR256
 
 log = logging.getLogger(__name__)
 
@@ -47,32 +47,38 @@ class TCPIntermediateO(TCP):
 
         temp = bytearray(nonce[55:7:-1])
 
-        self.encrypt = (nonce[8:40], nonce[40:56], bytearray(1))
-        self.decrypt = (temp[0:32], temp[32:48], bytearray(1))
+        self.encrypt = CTR256(nonce[8:40], nonce[40:56])
+        self.decrypt = CTR256(temp[0:32], temp[32:48])
 
-        nonce[56:64] = AES.ctr256_encrypt(nonce, *self.encrypt)[56:64]
+        nonce[56:64] = self.encrypt(nonce)[56:64]
 
         await super().send(nonce)
 
-    async def send(self, data: bytes, *args):
+    async def send(self, data: bytes or list, *args):
+        buffers = self.buffers(data)
+
+        # The cipher state carries over from one call to the next, so each buffer can be encrypted on its own (into a
+        # new object: ciphertext can't share memory with the caller's plaintext)
         await super().send(
-            AES.ctr256_encrypt(
-                pack("<i", len(data)) + data,
-                *self.encrypt
-            )
+            [self.encrypt(buffer)
+             for buffer in [pack("<i", sum(map(len, buffers)))] + buffers]
         )
 
-    async def recv(self, length: int = 0) -> bytes or None:
-        length = await super().recv(4)
+    def decode(self, buffer: bytearray, offset: int):
+        # CTR is a stream cipher: incoming chunks are decrypted within the receive buffer as they arrive, regardless of
+        # frame boundaries (see CTR256.transform for the copy this involves)
+        self.decrypt.transform(buffer, offset)
 
-        if length is None:
-            return None
+    def unpack(self, buffer: bytearray, offset: int) -> tuple:
+        if len(buffer) - offset < 4:
+            return 0, None
 
-        length = AES.ctr256_decrypt(length, *self.decrypt)
+        size = 4 + unpack_from("<i", buffer, offset)[0]
 
-        data = await super().recv(unpack("<i", length)[0])
+        if size < 4:
+            return 4, None
 
-        if data is None:
-            return None
+        if len(buffer) - offset < size:
+            return 0, None
 
-        return AES.ctr256_decrypt(data, *self.decrypt)
+        return size, buffer[offset + 4:offset + size]
@@ -16,7 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
-from .aes import AES
+from .aes import AES, CTR256
 from .kdf import KDF
 from .mtproto import MTProto
 from .prime import Prime
@@ -50,6 +50,28 @@ try:
                 len(a),
                 "big",
             )
+
+
+    class CTR256:
+        """Streaming AES-256-CTR context: each call continues the keystream where the previous one stopped.
+
+        TgCrypto only returns new objects: :meth:`transform` copies the result back into the buffer, and encrypting
+        outgoing data always produces a copy of it. Neither is zero-copy.
+        """
+
+        def __init__(self, key: bytes, iv: bytes):
+            self.key = bytes(key)
+            self.iv = bytearray(iv)
+            self.state = bytearray(1)
+
+        def __call__(self, data: bytes) -> bytes:
+            # TgCrypto refuses empty input
+            return tgcrypto.ctr256_encrypt(data, self.key, self.iv, self.state) if data else b""
+
+        def transform(self, buffer: bytearray, offset: int = 0):
+            # The bytes from offset onwards are encrypted into a new object and then copied back over themselves:
+            # the buffer is never resized nor reallocated, but the data is not transformed in place
+            buffer[offset:] = self(memoryview(buffer)[offset:])
 except ImportError:
     import pyaes
 
@@ -132,3 +154,37 @@ except ImportError:
                         chunk = cipher.encrypt(iv)
 
             return out
+
+
+    class CTR256:
+        """Streaming AES-256-CTR context: each call continues the keystream where the previous one stopped.
+
+        The key is expanded only once and data is XORed with the keystream as a whole instead of byte by byte.
+        """
+
+        def __init__(self, key: bytes, iv: bytes):
+            self.cipher = pyaes.AES(bytes(key))
+            self.counter = int.from_bytes(iv, "big")
+            self.keystream = bytearray()
+
+        def __call__(self, data: bytes) -> bytearray:
+            data = bytearray(data)
+            self.transform(data)
+
+            return data
+
+        def transform(self, buffer: bytearray, offset: int = 0):
+            length = len(buffer) - offset
+
+            while len(self.keystream) < length:
+                self.keystream += bytes(self.cipher.encrypt(self.counter.to_bytes(16, "big")))
+                self.counter = (self.counter + 1) % (1 << 128)
+
+            # As with TgCrypto the result is a new object copied back over the same bytes, not an in-place XOR
+            buffer[offset:] = int.to_bytes(
+                int.from_bytes(memoryview(buffer)[offset:], "big") ^ int.from_bytes(self.keystream[:length], "big"),
+                length,
+                "big"
+            )
+
+            del self.keystream[:length]
@@ -17,33 +17,54 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from hashlib import sha256
-from io import BytesIO
 from os import urandom
 
-from pyrogram.api.core import Message, Long
+from pyrogram.api.core import Message, Int, Long, BytesReader
 from . import AES, KDF
 
 
 class MTProto:
     @staticmethod
-    def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
-        data = Long(salt) + session_id + message.write()
-        padding = urandom(-(len(data) + 12) % 16 + 12)
+    def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> list:
+        if isinstance(message.body, bytearray):
+            # Fill in the room reserved in front of the serialized body instead of copying the body
+            data = message.body
+            data[:Message.RESERVED] = (
+                Long(salt)
+                + session_id
+                + Long(message.msg_id)
+                + Int(message.seq_no)
+                + Int(message.length)
+            )
+        else:
+            data = bytearray(Long(salt))
+            data += session_id
+            message.write_into(data)
+
+        size = len(data)
+        data += urandom(-(size + 12) % 16 + 12)
 
         # 88 = 88 + 0 (outgoing message)
-        msg_key_large = sha256(auth_key[88: 88 + 32] + data + padding).digest()
-        msg_key = msg_key_large[8:24]
+        msg_key_large = sha256(auth_key[88: 88 + 32])
+        msg_key_large.update(data)
+        msg_key = msg_key_large.digest()[8:24]
         aes_key, aes_iv = KDF(auth_key, msg_key, True)
 
-        return auth_key_id + msg_key + AES.ige256_encrypt(data + padding, aes_key, aes_iv)
+        encrypted = AES.ige256_encrypt(data, aes_key, aes_iv)
+
+        # The same body is sent again if the request has to be resent: leave it without the padding
+        del data[size:]
+
+        # Left as separate buffers, the transport writes them out without joining
+        return [auth_key_id, msg_key, encrypted]
 
     @staticmethod
-    def unpack(b: BytesIO, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> Message:
+    def unpack(b: BytesReader, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> Message:
         assert b.read(8) == auth_key_id, b.getvalue()
 
-        msg_key = b.read(16)
+        msg_key = bytes(b.read(16))
         aes_key, aes_iv = KDF(auth_key, msg_key, False)
-        data = BytesIO(AES.ige256_decrypt(b.read(), aes_key, aes_iv))
+        data = BytesReader(AES.ige256_decrypt(b.read(), aes_key, aes_iv))
         data.read(8)
 
         # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
@@ -54,7 +75,9 @@ class MTProto:
         # https://core.telegram.org/mtproto/security_guidelines#checking-sha256-hash-value-of-msg-key
         # https://core.telegram.org/mtproto/security_guidelines#checking-message-length
         # 96 = 88 + 8 (incoming message)
-        assert msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24]
+        msg_key_large = sha256(auth_key[96:96 + 32])
+        msg_key_large.update(data.getbuffer())
+        assert msg_key == msg_key_large.digest()[8:24]
 
         # https://core.telegram.org/mtproto/security_guidelines#checking-msg-id
         assert message.msg_id % 2 != 0
@@ -17,4 +17,6 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .auth import Auth
+from .retry_policy import RetryPolicy
 from .session import Session
+from .session_pool import SessionPool
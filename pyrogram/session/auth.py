@@ -20,11 +20,10 @@ import asyncio
 import logging
 import time
 from hashlib import sha1
-from io import BytesIO
 from os import urandom
 
 from pyrogram.api import functions, types
-from pyrogram.api.core import Object, Long, Int
+from pyrogram.api.core import Object, Long, Int, BytesReader
 from pyrogram.connection import Connection
 from pyrogram.crypto import AES, RSA, Prime
 from .internals import MsgId
@@ -34,6 +33,7 @@ log = logging.getLogger(__name__)
 
 class Auth:
     MAX_RETRIES = 5
+    TIMEOUT = 10
 
     def __init__(self, dc_id: int, test_mode: bool, ipv6: bool, proxy: dict):
         self.dc_id = dc_id
@@ -45,22 +45,24 @@ class Auth:
 
     @staticmethod
     def pack(data: Object) -> bytes:
+        data = data.write()
+
         return (
             bytes(8)
             + Long(MsgId())
-            + Int(len(data.write()))
-            + data.write()
+            + Int(len(data))
+            + data
         )
 
     @staticmethod
-    def unpack(b: BytesIO):
+    def unpack(b: BytesReader):
         b.seek(20)  # Skip auth_key_id (8), message_id (8) and message_length (4)
         return Object.read(b)
 
     async def send(self, data: Object):
         data = self.pack(data)
         await self.connection.send(data)
-        response = BytesIO(await self.connection.recv())
+        response = BytesReader(await self.connection.recv(self.TIMEOUT))
 
         return self.unpack(response)
 
@@ -159,7 +161,7 @@ class Auth:
                 answer_with_hash = AES.ige256_decrypt(encrypted_answer, tmp_aes_key, tmp_aes_iv)
                 answer = answer_with_hash[20:]
 
-                server_dh_inner_data = Object.read(BytesIO(answer))
+                server_dh_inner_data = Object.read(BytesReader(answer))
 
                 log.debug("Done decrypting answer")
 
@@ -17,5 +17,9 @@
 # along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .data_center import DataCenter
+from .endpoint_cache import EndpointCache
+from .in_flight_window import InFlightWindow
 from .msg_factory import MsgFactory
 from .msg_id import MsgId
+from .rtt_estimator import RTTEstimator
+from .timeout_heap import TimeoutHeap
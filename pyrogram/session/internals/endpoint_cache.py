@@ -0,0 +1,108 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from .data_center import DataCenter
+
+
+class EndpointCache:
+    # (test_mode, dc_id) -> {(ip_address, port): connect latency in seconds, None if never measured}
+    endpoints = {}
+
+    # (test_mode, dc_id) -> {(ip_address, port): consecutive failed attempts}, cleared by a successful one
+    failures = {}
+
+    # Weight of a new sample in the latency moving average
+    ALPHA = 0.3
+
+    @classmethod
+    def get(cls, dc_id: int, test_mode: bool, ipv6: bool) -> list:
+        """Return the known endpoints of a DC, the fastest first.
+
+        Endpoints never measured follow, the hard-coded addresses leading them, and endpoints whose last attempts
+        failed go last. IPv6 endpoints are left out unless ipv6 is enabled, in which case the IPv4 hard-coded
+        address still follows the IPv6 one as a fallback.
+        """
+        known = cls.endpoints.get((test_mode, dc_id), {})
+        failures = cls.failures.get((test_mode, dc_id), {})
+        candidates = []
+
+        for use_ipv6 in ((True, False) if ipv6 else (False,)):
+            try:
+                candidates.append(DataCenter(dc_id, test_mode, use_ipv6))
+            except KeyError:
+                pass
+
+        candidates += [
+            endpoint
+            for endpoint in known
+            if endpoint not in candidates and (ipv6 or ":" not in endpoint[0])
+        ]
+
+        return sorted(
+            candidates,
+            key=lambda endpoint: (
+                failures.get(endpoint, 0),
+                known.get(endpoint) is None,
+                known.get(endpoint) or 0
+            )
+        )
+
+    @classmethod
+    def add(cls, dc_id: int, test_mode: bool, endpoint: tuple):
+        cls.endpoints.setdefault((test_mode, dc_id), {}).setdefault(endpoint, None)
+
+    @classmethod
+    def add_options(cls, dc_options: list, test_mode: bool):
+        for option in dc_options:
+            # CDN, media-only and obfuscated-only (MTProxy) endpoints can't serve regular sessions
+            if option.cdn or option.media_only or option.tcpo_only:
+                continue
+
+            cls.add(option.id, test_mode, (option.ip_address, option.port))
+
+    @classmethod
+    def record(cls, dc_id: int, test_mode: bool, endpoint: tuple, latency: float or None):
+        failures = cls.failures.setdefault((test_mode, dc_id), {})
+
+        if latency is None:
+            failures[endpoint] = failures.get(endpoint, 0) + 1
+            return
+
+        failures.pop(endpoint, None)
+
+        endpoints = cls.endpoints.setdefault((test_mode, dc_id), {})
+        previous = endpoints.get(endpoint)
+
+        endpoints[endpoint] = (
+            latency
+            if previous is None
+            else (1 - cls.ALPHA) * previous + cls.ALPHA * latency
+        )
+
+    @classmethod
+    def dump(cls) -> list:
+        return [
+            [test_mode, dc_id, ip_address, port, latency]
+            for (test_mode, dc_id), endpoints in cls.endpoints.items()
+            for (ip_address, port), latency in endpoints.items()
+        ]
+
+    @classmethod
+    def load(cls, data: list):
+        for test_mode, dc_id, ip_address, port, latency in data:
+            cls.endpoints.setdefault((test_mode, dc_id), {}).setdefault((ip_address, port), latency)
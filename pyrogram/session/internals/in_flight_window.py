@@ -0,0 +1,98 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from collections import deque
+from time import monotonic
+
+
+class InFlightWindow:
+    # Requests waiting longer than MAX_WAIT seconds are admitted before any newer
+    # request with a higher priority, so that low priority lanes never starve
+    MAX_WAIT = 1.0
+
+    def __init__(self, size: int):
+        self.size = size
+        self.lanes = {}  # priority -> deque of (queued since, future); lower values are served first
+
+        self.in_flight = 0
+        self.depth = 0
+        self.max_depth = 0
+
+        self.queued = 0
+        self.queued_time = 0.0
+
+    async def acquire(self, priority: int = 0):
+        if self.in_flight < self.size and not self.depth:
+            self.in_flight += 1
+            return
+
+        waiter = (monotonic(), asyncio.get_event_loop().create_future())
+        lane = self.lanes.setdefault(priority, deque())
+
+        lane.append(waiter)
+        self.depth += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter[1].cancelled():
+                # release() might have already skipped and dropped the cancelled waiter
+                if waiter in lane:
+                    lane.remove(waiter)
+                    self.depth -= 1
+            else:
+                # The slot was handed over right before the cancellation
+                self.release()
+
+            raise
+        finally:
+            self.queued += 1
+            self.queued_time += monotonic() - waiter[0]
+
+    def release(self):
+        while True:
+            lane = self.next_lane()
+
+            if lane is None:
+                self.in_flight -= 1
+                return
+
+            self.depth -= 1
+            future = lane.popleft()[1]
+
+            # Waiters cancelled in the meantime are skipped
+            if not future.done():
+                # The slot goes straight to the next waiter, in_flight stays the same
+                future.set_result(None)
+                return
+
+    def next_lane(self) -> deque or None:
+        lanes = [self.lanes[priority] for priority in sorted(self.lanes) if self.lanes[priority]]
+
+        if not lanes:
+            return None
+
+        oldest = min(lanes, key=lambda lane: lane[0][0])
+
+        return oldest if monotonic() - oldest[0][0] >= self.MAX_WAIT else lanes[0]
+
+    @property
+    def average_queued_time(self) -> float:
+        return self.queued_time / self.queued if self.queued else 0.0
@@ -30,9 +30,13 @@ class MsgFactory:
         self.seq_no = SeqNo()
 
     def __call__(self, body: Object) -> Message:
+        # Serialize the body exactly once; the length is taken from the resulting bytes
+        data = bytearray(Message.RESERVED)
+        body.write_into(data)
+
         return Message(
-            body,
+            data,
             MsgId(),
             self.seq_no(type(body) not in not_content_related),
-            len(body)
+            len(data) - Message.RESERVED
         )
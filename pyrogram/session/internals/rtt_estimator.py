@@ -0,0 +1,46 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+class RTTEstimator:
+    # Smoothed round-trip time and variation as in RFC 6298. The resulting timeout is clamped between
+    # MIN_TIMEOUT and MAX_TIMEOUT seconds and is INITIAL_TIMEOUT until the first round-trip is measured
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    MIN_TIMEOUT = 2
+    MAX_TIMEOUT = 10
+    INITIAL_TIMEOUT = 5
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+
+    def update(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.INITIAL_TIMEOUT
+
+        return min(self.MAX_TIMEOUT, max(self.MIN_TIMEOUT, self.srtt + 4 * self.rttvar))
@@ -0,0 +1,86 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import heapq
+import math
+from itertools import count
+
+
+class TimeoutHeap:
+    # Deadlines are rounded up to a multiple of RESOLUTION seconds, so that
+    # requests sent close to each other expire together in a single tick
+    RESOLUTION = 0.1
+
+    def __init__(self):
+        self.heap = []
+        self.counter = count()
+
+        self.handle = None
+        self.handle_when = None
+
+    def add(self, future: asyncio.Future, timeout: float):
+        loop = asyncio.get_event_loop()
+
+        entry = [loop.time() + timeout, next(self.counter), future]
+
+        heapq.heappush(self.heap, entry)
+        future.add_done_callback(lambda _: self.discard(entry))
+        self.schedule(loop)
+
+    @staticmethod
+    def discard(entry: list):
+        # A done future is dropped from its entry, so that its result (e.g.: a downloaded file part) isn't kept
+        # alive until the deadline. The empty entry is skipped once it expires
+        entry[2] = None
+
+    def schedule(self, loop: asyncio.AbstractEventLoop):
+        if not self.heap:
+            return
+
+        when = math.ceil(self.heap[0][0] / self.RESOLUTION) * self.RESOLUTION
+
+        if self.handle is not None:
+            if self.handle_when <= when:
+                return
+
+            self.handle.cancel()
+
+        self.handle = loop.call_at(when, self.expire)
+        self.handle_when = when
+
+    def expire(self):
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+
+        self.handle = None
+
+        while self.heap and self.heap[0][0] <= now:
+            future = heapq.heappop(self.heap)[2]
+
+            if future is not None and not future.done():
+                future.set_exception(TimeoutError())
+
+        self.schedule(loop)
+
+    def clear(self):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+
+        self.heap.clear()
@@ -0,0 +1,106 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import random
+
+from pyrogram.errors import InternalServerError
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is sent again.
+
+    Delays grow exponentially with each attempt and are jittered, so that clients failing at the same time don't all
+    retry in lockstep. Subclass and override :meth:`next_delay` to implement a different strategy.
+
+    Args:
+        retries (``int``, *optional*):
+            Maximum number of retries for a single request. Defaults to 5.
+
+        base_delay (``float``, *optional*):
+            Delay in seconds before the first retry. Defaults to 0.5.
+
+        max_delay (``float``, *optional*):
+            Upper bound in seconds for a single delay. Defaults to 30.
+
+        factor (``float``, *optional*):
+            Multiplier applied to the delay after each attempt. Defaults to 2.
+
+        jitter (``bool``, *optional*):
+            Pass False to wait exactly the computed delay. By default, a random delay between half and the whole
+            computed delay is used.
+
+        budgets (``dict``, *optional*):
+            Maximum number of retries per error class, e.g.: ``{TimeoutError: 2}``. Errors not listed here are only
+            bound by *retries*.
+
+        deadline (``float``, *optional*):
+            Overall time in seconds a request may take, retries included. No retry is attempted if its delay would
+            exceed the deadline.
+    """
+
+    ERRORS = (OSError, TimeoutError, InternalServerError)
+
+    def __init__(self,
+                 retries: int = 5,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30,
+                 factor: float = 2,
+                 jitter: bool = True,
+                 budgets: dict = None,
+                 deadline: float = None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.budgets = budgets or {}
+        self.deadline = deadline
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.factor ** attempt)
+
+        return delay / 2 + random.uniform(0, delay / 2) if self.jitter else delay
+
+    def next_delay(self, failures: list, elapsed: float) -> float or None:
+        """Return the seconds to wait before the next attempt, or None to give up.
+
+        Args:
+            failures (``list``):
+                The errors raised by the previous attempts, the most recent last.
+
+            elapsed (``float``):
+                Seconds passed since the first attempt.
+        """
+        error = failures[-1]
+
+        if len(failures) > self.retries:
+            return None
+
+        for error_class, budget in self.budgets.items():
+            if isinstance(error, error_class):
+                if sum(isinstance(e, error_class) for e in failures) > budget:
+                    return None
+
+                break
+
+        delay = self.delay(len(failures) - 1)
+
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+
+        return delay
@@ -20,36 +20,56 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 from hashlib import sha1
-from io import BytesIO
+from time import monotonic
 
 import pyrogram
 from pyrogram import __copyright__, __license__, __version__
 from pyrogram.api import functions, types
 from pyrogram.api.all import layer
-from pyrogram.api.core import Object, MsgContainer, Int, Long, FutureSalt, FutureSalts
-from pyrogram.errors import RPCError, InternalServerError, AuthKeyDuplicated
+from pyrogram.api.core import Object, Message, MsgContainer, Int, Long, FutureSalt, FutureSalts, BytesReader
+from pyrogram.errors import RPCError, AuthKeyDuplicated
 from pyrogram.connection import Connection
 from pyrogram.crypto import MTProto
-from .internals import MsgId, MsgFactory
+from .internals import MsgId, MsgFactory, InFlightWindow, TimeoutHeap, RTTEstimator, EndpointCache
+from .retry_policy import RetryPolicy
 
 log = logging.getLogger(__name__)
 
 
-class Result:
-    def __init__(self):
-        self.value = None
-        self.event = asyncio.Event()
-
-
 class Session:
     INITIAL_SALT = 0x616e67656c696361
-    NET_WORKERS = 1
     START_TIMEOUT = 1
     WAIT_TIMEOUT = 15
     MAX_RETRIES = 5
-    ACKS_THRESHOLD = 8
+    # A ping is only sent after PING_INTERVAL seconds without incoming traffic, or as soon as a request has
+    # been waiting longer than the RTT-based timeout without any packet coming in. The connection is
+    # considered dead when the pong doesn't arrive within that same timeout
     PING_INTERVAL = 5
 
+    # Outgoing messages are held for up to BATCH_WINDOW seconds and sent together inside a single
+    # MsgContainer, unless BATCH_MAX_MESSAGES or BATCH_MAX_SIZE (bytes) is reached earlier.
+    # High priority messages are sent as soon as possible, ahead of the others
+    BATCH_WINDOW = 0.005
+    BATCH_MAX_MESSAGES = 100
+    BATCH_MAX_SIZE = 1044448
+
+    # Pending acks ride along with the next outgoing batch and are only sent
+    # on their own after ACKS_DELAY seconds without any outgoing traffic
+    ACKS_DELAY = 0.5
+
+    # At most MAX_IN_FLIGHT requests sent through send() may await a response at the same time;
+    # further calls wait for a free slot (see the InFlightWindow metrics in Session.window)
+    MAX_IN_FLIGHT = 1024
+
+    # Requests waiting for a free slot are admitted, and queued messages are sent, in priority order
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+
+    # Decrypt and dispatch incoming packets straight from the read loop instead of handing them over to the
+    # NetWorker task
+    INLINE_DISPATCH = False
+
     notice_displayed = False
 
     BAD_MSG_DESCRIPTION = {
@@ -71,7 +91,8 @@ class Session:
                  dc_id: int,
                  auth_key: bytes,
                  is_media: bool = False,
-                 is_cdn: bool = False):
+                 is_cdn: bool = False,
+                 receive_updates: bool = True):
         if not Session.notice_displayed:
             print("Pyrogram v{}, {}".format(__version__, __copyright__))
             print("Licensed under the terms of the " + __license__, end="\n\n")
@@ -82,6 +103,7 @@ class Session:
         self.auth_key = auth_key
         self.is_media = is_media
         self.is_cdn = is_cdn
+        self.receive_updates = receive_updates
 
         self.connection = None
 
@@ -94,12 +116,29 @@ class Session:
 
         self.pending_acks = set()
 
+        self.outgoing = []
+        self.outgoing_size = 0
+        self.flush_handle = None
+        self.acks_handle = None
+
         self.recv_queue = asyncio.Queue()
-        self.results = {}
+        self.results = {}  # msg_id -> Future awaiting the response
+        self.requests = {}  # Future -> Message currently carrying the request
+        self.containers = {}  # Container msg_id -> (msg_ids of the messages inside, acks inside)
+        self.timeouts = TimeoutHeap()
+        self.window = InFlightWindow(self.MAX_IN_FLIGHT)
 
         self.ping_task = None
         self.ping_task_event = asyncio.Event()
 
+        self.last_recv = monotonic()
+        self.last_ping = 0
+        self.waiting_since = 0  # Since when requests have been awaiting a response without interruption
+        self.rtt = RTTEstimator()
+        self.probe_handle = None
+        self.probe_task = None
+        self.probing = False
+
         self.next_salt_task = None
         self.next_salt_task_event = asyncio.Event()
 
@@ -109,29 +148,42 @@ class Session:
         self.is_connected = asyncio.Event()
 
     async def start(self):
+        # Requests left unanswered by a previous connection are sent again once the new one is ready
+        unanswered = list(self.results)
+
         while True:
             self.connection = Connection(self.dc_id, self.client.test_mode, self.client.ipv6, self.client.proxy)
 
             try:
                 await self.connection.connect()
+                self.last_recv = monotonic()
+
+                if not self.INLINE_DISPATCH:
+                    self.net_worker_task = asyncio.ensure_future(self.net_worker())
 
-                self.net_worker_task = asyncio.ensure_future(self.net_worker())
                 self.recv_task = asyncio.ensure_future(self.recv())
 
                 self.current_salt = FutureSalt(0, 0, Session.INITIAL_SALT)
+                sent = monotonic()
                 self.current_salt = FutureSalt(
                     0, 0,
                     (await self._send(
                         functions.Ping(ping_id=0),
-                        timeout=self.START_TIMEOUT
+                        timeout=self.START_TIMEOUT,
+                        batch=False
                     )).new_server_salt
                 )
-                self.current_salt = (await self._send(functions.GetFutureSalts(num=1), timeout=self.START_TIMEOUT)).salts[0]
+                self.rtt.update(monotonic() - sent)
+                self.current_salt = (await self._send(
+                    functions.GetFutureSalts(num=1),
+                    timeout=self.START_TIMEOUT,
+                    batch=False
+                )).salts[0]
 
                 self.next_salt_task = asyncio.ensure_future(self.next_salt())
 
                 if not self.is_cdn:
-                    await self._send(
+                    config = await self._send(
                         functions.InvokeWithLayer(
                             layer=layer,
                             query=functions.InitConnection(
@@ -145,9 +197,13 @@ class Session:
                                 query=functions.help.GetConfig(),
                             )
                         ),
-                        timeout=self.START_TIMEOUT
+                        timeout=self.START_TIMEOUT,
+                        batch=False
                     )
 
+                    # Alternative DC addresses take part in the connection race from now on
+                    EndpointCache.add_options(config.dc_options, self.client.test_mode)
+
                 self.ping_task = asyncio.ensure_future(self.ping())
 
                 log.info("Session initialized: Layer {}".format(layer))
@@ -158,7 +214,7 @@ class Session:
                 await self.stop()
                 raise e
             except (OSError, TimeoutError, RPCError):
-                await self.stop()
+                await self.stop(restart=True)
             except Exception as e:
                 await self.stop()
                 raise e
@@ -167,16 +223,33 @@ class Session:
 
         self.is_connected.set()
 
+        self.resend(unanswered)
+        self.schedule_probe()
+
         log.info("Session started")
 
-    async def stop(self):
+    async def stop(self, restart: bool = False):
         self.is_connected.clear()
 
         self.ping_task_event.set()
         self.next_salt_task_event.set()
 
         if self.ping_task is not None:
-            await self.ping_task
+            # The ping task might be waiting for a pong that will never arrive
+            self.ping_task.cancel()
+
+            try:
+                await self.ping_task
+            except asyncio.CancelledError:
+                pass
+
+        if self.probe_handle is not None:
+            self.probe_handle.cancel()
+            self.probe_handle = None
+
+        if self.probe_task is not None:
+            self.probe_task.cancel()
+            self.probe_task = None
 
         if self.next_salt_task is not None:
             await self.next_salt_task
@@ -184,6 +257,8 @@ class Session:
         self.ping_task_event.clear()
         self.next_salt_task_event.clear()
 
+        self.drop_outgoing(restart)
+
         self.connection.close()
 
         if self.recv_task:
@@ -192,10 +267,15 @@ class Session:
         if self.net_worker_task:
             await self.net_worker_task
 
-        for i in self.results.values():
-            i.event.set()
+        if not restart:
+            for future in self.results.values():
+                if not future.done():
+                    future.set_exception(TimeoutError())
+
+            self.timeouts.clear()
+            self.containers.clear()
 
-        if not self.is_media and callable(self.client.disconnect_handler):
+        if not self.is_media and self.receive_updates and callable(self.client.disconnect_handler):
             try:
                 await self.client.disconnect_handler(self.client)
             except Exception as e:
@@ -204,7 +284,7 @@ class Session:
         log.info("Session stopped")
 
     async def restart(self):
-        await self.stop()
+        await self.stop(restart=True)
         await self.start()
 
     async def net_worker(self):
@@ -216,88 +296,166 @@ class Session:
             if packet is None:
                 break
 
-            try:
-                data = MTProto.unpack(
-                    BytesIO(packet),
-                    self.session_id,
-                    self.auth_key,
-                    self.auth_key_id
-                )
+            await self.handle_packet(packet)
 
-                messages = (
-                    data.body.messages
-                    if isinstance(data.body, MsgContainer)
-                    else [data]
-                )
+        log.info("NetWorkerTask stopped")
+
+    async def handle_packet(self, packet: bytes):
+        try:
+            data = MTProto.unpack(
+                BytesReader(packet),
+                self.session_id,
+                self.auth_key,
+                self.auth_key_id
+            )
+
+            messages = (
+                data.body.messages
+                if isinstance(data.body, MsgContainer)
+                else [data]
+            )
+
+            log.debug(data)
+
+            for msg in messages:
+                if msg.seq_no % 2 != 0:
+                    if msg.msg_id in self.pending_acks:
+                        continue
+                    else:
+                        self.pending_acks.add(msg.msg_id)
 
-                log.debug(data)
+                if isinstance(msg.body, (types.MsgDetailedInfo, types.MsgNewDetailedInfo)):
+                    self.pending_acks.add(msg.body.answer_msg_id)
+                    continue
 
-                for msg in messages:
-                    if msg.seq_no % 2 != 0:
-                        if msg.msg_id in self.pending_acks:
-                            continue
-                        else:
-                            self.pending_acks.add(msg.msg_id)
+                if isinstance(msg.body, types.NewSessionCreated):
+                    continue
 
-                    if isinstance(msg.body, (types.MsgDetailedInfo, types.MsgNewDetailedInfo)):
-                        self.pending_acks.add(msg.body.answer_msg_id)
-                        continue
+                msg_id = None
 
-                    if isinstance(msg.body, types.NewSessionCreated):
+                if isinstance(msg.body, (types.BadMsgNotification, types.BadServerSalt)):
+                    msg_id = msg.body.bad_msg_id
+
+                    if msg_id in self.containers:
+                        self.bad_container(msg_id, msg.body)
                         continue
+                elif isinstance(msg.body, (FutureSalts, types.RpcResult)):
+                    msg_id = msg.body.req_msg_id
+                elif isinstance(msg.body, types.Pong):
+                    msg_id = msg.body.msg_id
+                else:
+                    # Updates that still reach a session not meant to receive them (e.g.: the extra sessions of a
+                    # SessionPool) are dropped: the main session delivers them already
+                    if self.client is not None and self.receive_updates:
+                        # Never wait for room in the updates queue: the updates worker may itself be waiting for
+                        # a response that only this very session can deliver
+                        try:
+                            self.client.updates_queue.put_nowait(msg.body)
+                        except asyncio.QueueFull:
+                            self.client.updates_overflow(msg.body)
 
-                    msg_id = None
+                future = self.results.pop(msg_id, None)
 
-                    if isinstance(msg.body, (types.BadMsgNotification, types.BadServerSalt)):
-                        msg_id = msg.body.bad_msg_id
-                    elif isinstance(msg.body, (FutureSalts, types.RpcResult)):
-                        msg_id = msg.body.req_msg_id
-                    elif isinstance(msg.body, types.Pong):
-                        msg_id = msg.body.msg_id
-                    else:
-                        if self.client is not None:
-                            self.client.updates_queue.put_nowait(msg.body)
+                if future is not None and not future.done():
+                    future.set_result(getattr(msg.body, "result", msg.body))
 
-                    if msg_id in self.results:
-                        self.results[msg_id].value = getattr(msg.body, "result", msg.body)
-                        self.results[msg_id].event.set()
+            if self.pending_acks and self.acks_handle is None:
+                self.acks_handle = asyncio.get_event_loop().call_later(self.ACKS_DELAY, self.flush)
+        except Exception as e:
+            log.error(e, exc_info=True)
 
-                if len(self.pending_acks) >= self.ACKS_THRESHOLD:
-                    log.info("Send {} acks".format(len(self.pending_acks)))
+    def bad_container(self, msg_id: int, notification: types.BadMsgNotification or types.BadServerSalt):
+        # Errors about a container refer to the container msg_id: they apply to every message inside it
+        msg_ids, acks = self.containers.pop(msg_id)
+        self.pending_acks.update(acks)
 
-                    try:
-                        await self._send(types.MsgsAck(msg_ids=list(self.pending_acks)), False)
-                    except (OSError, TimeoutError):
-                        pass
-                    else:
-                        self.pending_acks.clear()
-            except Exception as e:
-                log.error(e, exc_info=True)
+        if isinstance(notification, types.BadServerSalt):
+            self.current_salt = FutureSalt(
+                self.current_salt.valid_since,
+                self.current_salt.valid_until,
+                notification.new_server_salt
+            )
 
-        log.info("NetWorkerTask stopped")
+            self.resend(msg_ids)
+        else:
+            for msg_id in msg_ids:
+                future = self.results.pop(msg_id, None)
+
+                if future is not None and not future.done():
+                    future.set_result(notification)
 
     async def ping(self):
         log.info("PingTask started")
 
         while True:
+            # Any incoming packet proves the connection alive and postpones the next ping
+            delay = max(0, max(self.last_recv, self.last_ping) + self.PING_INTERVAL - monotonic())
+
             try:
-                await asyncio.wait_for(self.ping_task_event.wait(), self.PING_INTERVAL)
+                await asyncio.wait_for(self.ping_task_event.wait(), delay)
             except asyncio.TimeoutError:
                 pass
             else:
                 break
 
-            try:
-                await self._send(
-                    functions.PingDelayDisconnect(
-                        ping_id=0, disconnect_delay=self.WAIT_TIMEOUT + 10
-                    ), False
-                )
-            except (OSError, TimeoutError, RPCError):
-                pass
+            if monotonic() - max(self.last_recv, self.last_ping) < self.PING_INTERVAL:
+                continue
+
+            if not await self.probe():
+                break
 
         log.info("PingTask stopped")
 
+    async def probe(self) -> bool:
+        if self.probing:
+            return True
+
+        self.probing = True
+        self.last_ping = monotonic()
+        timeout = self.rtt.timeout
+
+        try:
+            # A plain Ping: PingDelayDisconnect starts a server-side disconnect timer that only another
+            # PingDelayDisconnect resets, while pings are skipped as long as packets keep coming in.
+            # Pings are timed, so they must not wait behind queued requests either
+            await self._send(
+                functions.Ping(ping_id=0),
+                timeout=timeout,
+                priority=self.PRIORITY_HIGH
+            )
+        except TimeoutError:
+            log.warning("No pong received within {:.2f}s, reconnecting".format(timeout))
+            self.connection.close()
+            return False
+        except (OSError, RPCError):
+            pass
+        else:
+            self.rtt.update(monotonic() - self.last_ping)
+        finally:
+            self.probing = False
+
+        return True
+
+    def schedule_probe(self):
+        if self.probe_handle is not None or not self.results or not self.is_connected.is_set():
+            return
+
+        # Requests are only suspicious once nothing at all came in for longer than the timeout since they were sent
+        delay = max(self.waiting_since, self.last_recv, self.last_ping) + self.rtt.timeout - monotonic()
+        self.probe_handle = asyncio.get_event_loop().call_later(max(0, delay), self.check_probe)
+
+    def check_probe(self):
+        self.probe_handle = None
+
+        if not self.results or not self.is_connected.is_set():
+            return
+
+        if monotonic() - max(self.waiting_since, self.last_recv, self.last_ping) >= self.rtt.timeout:
+            self.probe_task = asyncio.ensure_future(self.probe())
+            self.probe_task.add_done_callback(lambda _: self.schedule_probe())
+        else:
+            self.schedule_probe()
+
     async def next_salt(self):
         log.info("NextSaltTask started")
 
@@ -335,77 +493,260 @@ class Session:
             packet = await self.connection.recv()
 
             if packet is None or len(packet) == 4:
-                self.recv_queue.put_nowait(None)
+                if not self.INLINE_DISPATCH:
+                    self.recv_queue.put_nowait(None)
 
                 if packet:
-                    log.warning("Server sent \"{}\"".format(Int.read(BytesIO(packet))))
+                    log.warning("Server sent \"{}\"".format(Int.read(BytesReader(packet))))
 
                 if self.is_connected.is_set():
                     asyncio.ensure_future(self.restart())
 
                 break
 
-            self.recv_queue.put_nowait(packet)
+            self.last_recv = monotonic()
+
+            if self.INLINE_DISPATCH:
+                await self.handle_packet(packet)
+            else:
+                self.recv_queue.put_nowait(packet)
 
         log.info("RecvTask stopped")
 
-    async def _send(self, data: Object, wait_response: bool = True, timeout: float = WAIT_TIMEOUT):
-        message = self.msg_factory(data)
-        msg_id = message.msg_id
+    def enqueue(self, message: Message, batch: bool = True, priority: int = PRIORITY_NORMAL) -> asyncio.Future:
+        future = asyncio.get_event_loop().create_future()
+
+        if not batch:
+            # Sent right away, on its own
+            asyncio.ensure_future(self.send_batch([(message, future)]))
+            return future
+
+        self.outgoing.append((priority, message, future))
+        self.outgoing_size += message.length + 16  # msg_id, seq_no and length header inside a container
+
+        if len(self.outgoing) >= self.BATCH_MAX_MESSAGES or self.outgoing_size >= self.BATCH_MAX_SIZE:
+            self.flush()
+        elif priority == self.PRIORITY_HIGH:
+            # Don't wait for the batch window, but still batch with whatever else is enqueued in the same tick
+            if self.flush_handle is not None:
+                self.flush_handle.cancel()
+
+            self.flush_handle = asyncio.get_event_loop().call_soon(self.flush)
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_event_loop().call_later(self.BATCH_WINDOW, self.flush)
+
+        return future
+
+    def cancel_flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        if self.acks_handle is not None:
+            self.acks_handle.cancel()
+            self.acks_handle = None
+
+    def flush(self):
+        self.cancel_flush()
+
+        # Batches are written in the order they are scheduled: higher priorities go first and never share a
+        # container with lower ones, which would hold them back until the whole container has been received
+        outgoing = sorted(self.outgoing, key=lambda entry: entry[0])
+
+        self.outgoing = []
+        self.outgoing_size = 0
+
+        # Pending acks ride along in the first batch: their MsgsAck (header, vector and 8 bytes per msg_id) counts
+        # towards the container size limit like any other message
+        acks = list(self.pending_acks)
+        self.pending_acks.clear()
+
+        batch = []
+        batch_priority = None
+        batch_size = 16 + 12 + len(acks) * 8 if acks else 0
+
+        for priority, message, future in outgoing:
+            size = message.length + 16
+
+            if batch and (
+                priority != batch_priority
+                or len(batch) >= self.BATCH_MAX_MESSAGES - (1 if acks else 0)
+                or batch_size + size > self.BATCH_MAX_SIZE
+            ):
+                asyncio.ensure_future(self.send_batch(batch, acks))
+                acks = []
+                batch = []
+                batch_size = 0
+
+            batch.append((message, future))
+            batch_priority = priority
+            batch_size += size
+
+        # An empty batch still carries the pending acks
+        asyncio.ensure_future(self.send_batch(batch, acks))
+
+    def drop_outgoing(self, restart: bool = False):
+        self.cancel_flush()
+
+        # On restart, requests still waiting in the queue are treated as sent: they are resent, together with the
+        # other unanswered requests, as soon as the session is started again
+        for _, _, future in self.outgoing:
+            if not future.done():
+                if restart:
+                    future.set_result(None)
+                else:
+                    future.set_exception(OSError("Session stopped"))
+
+        self.outgoing = []
+        self.outgoing_size = 0
+
+    def resend(self, msg_ids: list):
+        for msg_id in msg_ids:
+            future = self.results.pop(msg_id, None)
+
+            if future is None or future.done():
+                continue
+
+            # The body is already serialized; only the msg_id and seq_no are renewed
+            old = self.requests[future]
+            message = Message(old.body, MsgId(), self.msg_factory.seq_no(old.seq_no % 2 != 0), old.length)
+
+            self.requests[future] = message
+            self.results[message.msg_id] = future
+
+            # Failures are not reported back: a broken connection restarts the session and resends again
+            self.enqueue(message).add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        if msg_ids:
+            log.info("Resent {} unanswered requests".format(len(msg_ids)))
 
-        if wait_response:
-            self.results[msg_id] = Result()
+    async def send_batch(self, batch: list, acks: list = None):
+        messages = [message for message, _ in batch]
+        acks = acks or []
 
-        payload = MTProto.pack(
-            message,
-            self.current_salt.salt,
-            self.session_id,
-            self.auth_key,
-            self.auth_key_id
-        )
+        if acks:
+            log.debug("Send {} acks".format(len(acks)))
+            messages.append(self.msg_factory(types.MsgsAck(msg_ids=acks)))
+
+        if not messages:
+            return
+
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = self.msg_factory(MsgContainer(messages))
+
+            self.prune_containers()
+            self.containers[message.msg_id] = ([m.msg_id for m, _ in batch], acks)
 
         try:
+            payload = MTProto.pack(
+                message,
+                self.current_salt.salt,
+                self.session_id,
+                self.auth_key,
+                self.auth_key_id
+            )
+
             await self.connection.send(payload)
-        except OSError as e:
-            self.results.pop(msg_id, None)
-            raise e
+        except Exception as e:
+            self.pending_acks.update(acks)
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    def prune_containers(self):
+        # Containers are remembered, oldest first, for as long as any of their requests awaits a response
+        for msg_id, (msg_ids, _) in list(self.containers.items()):
+            if any(i in self.results for i in msg_ids):
+                break
 
-        if wait_response:
-            try:
-                await asyncio.wait_for(self.results[msg_id].event.wait(), timeout)
-            except asyncio.TimeoutError:
-                pass
+            del self.containers[msg_id]
 
-            result = self.results.pop(msg_id).value
-
-            if result is None:
-                raise TimeoutError
-            elif isinstance(result, types.RpcError):
-                RPCError.raise_it(result, type(data))
-            elif isinstance(result, types.BadMsgNotification):
-                raise Exception(self.BAD_MSG_DESCRIPTION.get(
-                    result.error_code,
-                    "Error code {}".format(result.error_code)
-                ))
-            else:
-                return result
+    async def _send(self,
+                    data: Object,
+                    wait_response: bool = True,
+                    timeout: float = WAIT_TIMEOUT,
+                    batch: bool = True,
+                    priority: int = PRIORITY_NORMAL):
+        message = self.msg_factory(data)
+
+        if not wait_response:
+            await self.enqueue(message, batch, priority)
+            return
+
+        future = asyncio.get_event_loop().create_future()
+
+        if not self.results:
+            self.waiting_since = monotonic()
+
+        self.results[message.msg_id] = future
+        self.requests[future] = message
+        self.timeouts.add(future, timeout)
+        self.schedule_probe()
 
-    async def send(self, data: Object, retries: int = MAX_RETRIES, timeout: float = WAIT_TIMEOUT):
+        try:
+            await self.enqueue(message, batch, priority)
+            result = await future
+        finally:
+            # The msg_id changes if the request has been resent after a restart
+            self.results.pop(self.requests.pop(future).msg_id, None)
+
+        if isinstance(result, types.RpcError):
+            RPCError.raise_it(result, type(data))
+        elif isinstance(result, types.BadMsgNotification):
+            raise Exception(self.BAD_MSG_DESCRIPTION.get(
+                result.error_code,
+                "Error code {}".format(result.error_code)
+            ))
+        else:
+            return result
+
+    async def send(self,
+                   data: Object,
+                   retries: int = MAX_RETRIES,
+                   timeout: float = WAIT_TIMEOUT,
+                   retry_policy: RetryPolicy = None,
+                   priority: int = PRIORITY_NORMAL):
         try:
             await asyncio.wait_for(self.is_connected.wait(), self.WAIT_TIMEOUT)
         except asyncio.TimeoutError:
             pass
 
-        try:
-            return await self._send(data, timeout=timeout)
-        except (OSError, TimeoutError, InternalServerError) as e:
-            if retries == 0:
-                raise e from None
-
-            (log.warning if retries < 3 else log.info)(
-                "{}: {} Retrying {}".format(
-                    Session.MAX_RETRIES - retries,
-                    datetime.now(), type(data)))
-
-            await asyncio.sleep(0.5)
-            return await self.send(data, retries - 1, timeout)
+        if retry_policy is None:
+            retry_policy = RetryPolicy(retries=retries)
+
+        failures = []
+        start = monotonic()
+
+        while True:
+            attempt_timeout = timeout
+
+            if retry_policy.deadline is not None:
+                attempt_timeout = max(0, min(timeout, retry_policy.deadline - (monotonic() - start)))
+
+            try:
+                await self.window.acquire(priority)
+
+                try:
+                    return await self._send(data, timeout=attempt_timeout, priority=priority)
+                finally:
+                    self.window.release()
+            except retry_policy.ERRORS as e:
+                failures.append(e)
+                delay = retry_policy.next_delay(failures, monotonic() - start)
+
+                if delay is None:
+                    raise e from None
+
+                (log.warning if len(failures) > 2 else log.info)(
+                    "{}: {} Retrying {} in {:.2f}s".format(
+                        len(failures),
+                        datetime.now(), type(data), delay))
+
+                await asyncio.sleep(delay)
@@ -0,0 +1,120 @@
+# Pyrogram - Telegram MTProto API Client Library for Python
+# Copyright (C) 2017-2019 Dan Tès <https://github.com/delivrance>
+#
+# This file is part of Pyrogram.
+#
+# Pyrogram is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Pyrogram is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+
+from pyrogram.api import functions, types
+from pyrogram.api.core import Object
+from .retry_policy import RetryPolicy
+from .session import Session
+
+log = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """Spread requests over several sessions connected to the same DC with the same authorization key.
+
+    Requests go to the session with the fewest requests in flight, except requests that target a peer: these are
+    pinned to a session chosen by the peer id so that calls on the same chat keep their order. Requests on the own
+    chat and message operations that name no peer (e.g.: deleting messages by id) always go to the main session.
+    Only the main session receives updates.
+
+    Args:
+        session (:obj:`Session`):
+            The main, already started, session.
+
+        size (``int``):
+            Total number of sessions in the pool, main session included.
+    """
+
+    PEER_FIELDS = ("peer", "to_peer", "channel")
+    PEER_ATTRIBUTES = ("user_id", "chat_id", "channel_id")
+    SELF = (types.InputPeerSelf, types.InputUserSelf)
+
+    # Pin key of the main session
+    MAIN = "main"
+
+    def __init__(self, session: Session, size: int):
+        self.session = session
+
+        self.sessions = [session] + [
+            # Only the main session delivers updates and reports disconnections
+            Session(session.client, session.dc_id, session.auth_key, receive_updates=False)
+            for _ in range(size - 1)
+        ]
+
+    async def start(self):
+        await asyncio.gather(*[session.start() for session in self.sessions[1:]])
+        log.info("SessionPool started with {} sessions".format(len(self.sessions)))
+
+    async def stop(self):
+        await asyncio.gather(*[session.stop() for session in self.sessions[1:]])
+        log.info("SessionPool stopped")
+
+    @staticmethod
+    def load(session: Session) -> int:
+        return session.window.in_flight + session.window.depth
+
+    def key_of(self, data: Object):
+        # Unwrap Invoke* wrappers to find the actual query
+        while hasattr(data, "query") and isinstance(data.query, Object):
+            data = data.query
+
+        for field in self.PEER_FIELDS:
+            peer = getattr(data, field, None)
+
+            if isinstance(peer, self.SELF):
+                return self.MAIN
+
+            for attribute in self.PEER_ATTRIBUTES:
+                peer_id = getattr(peer, attribute, None)
+
+                if peer_id is not None:
+                    return peer_id
+
+        if getattr(data, "QUALNAME", "").startswith("messages."):
+            return self.MAIN
+
+        return None
+
+    def pick(self, data: Object, key=None) -> Session:
+        if key is None:
+            key = self.key_of(data)
+
+        if key == self.MAIN:
+            return self.session
+
+        if key is not None:
+            return self.sessions[hash(key) % len(self.sessions)]
+
+        return min(self.sessions, key=self.load)
+
+    async def send(self,
+                   data: Object,
+                   retries: int = Session.MAX_RETRIES,
+                   timeout: float = Session.WAIT_TIMEOUT,
+                   retry_policy: RetryPolicy = None,
+                   key=None,
+                   priority: int = Session.PRIORITY_NORMAL):
+        session = self.pick(data, key)
+
+        if session is not self.session and not isinstance(data, functions.InvokeWithoutUpdates):
+            data = functions.InvokeWithoutUpdates(query=data)
+
+        return await session.send(data, retries, timeout, retry_policy, priority)
@@ -103,7 +103,8 @@ class Generate(Command):
 
     user_options = [
         ("api", None, "Generate API files"),
-        ("docs", None, "Generate docs files")
+        ("docs", None, "Generate docs files"),
+        ("consolidated", None, "Generate one API module per namespace instead of one per class")
     ]
 
     def __init__(self, dist, **kw):
@@ -111,6 +112,7 @@ class Generate(Command):
 
         self.api = None
         self.docs = None
+        self.consolidated = None
 
     def initialize_options(self):
         pass
@@ -121,7 +123,7 @@ class Generate(Command):
     def run(self):
         if self.api:
             error_compiler.start()
-            api_compiler.start()
+            api_compiler.start(consolidated=bool(self.consolidated))
 
         if self.docs:
             docs_compiler.start()